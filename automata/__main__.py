@@ -1,12 +1,258 @@
+import argparse
 import sys
 import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Iterator, List, Optional
 
+from automata.core.daemon_client import DaemonClient, DaemonError
 from automata.logging import setup_logging
-from automata.ui.cli import start_game
+from automata.ui.screen import play_game
 
+# The commands import the rest of the package themselves, when they run
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m automata", description="Rock, Paper, Scissors, Lizard, Spock"
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="play the game in-process, even if a daemon is running",
+    )
+    parser.add_argument(
+        "--strategy",
+        help="how the computer picks its moves: random (default) or markov",
+    )
+    parser.add_argument(
+        "--move-deadline-ms",
+        type=float,
+        help="fall back to a random move if the strategy takes longer than this",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        help="profile the command, writing PREFIX.pstats and PREFIX.folded",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="with --profile, also write allocations per turn to PREFIX.memory.txt",
+    )
+    parser.add_argument(
+        "--sample-interval-ms",
+        type=float,
+        default=1.0,
+        help="with --profile, how often to sample stacks for PREFIX.folded",
+    )
+
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("play", help="play the game (default)")
+    commands.add_parser(
+        "daemon",
+        help="run the game daemon in the foreground - "
+        "--strategy and --move-deadline-ms apply to the games it plays",
+    )
+
+    replay_parser = commands.add_parser(
+        "replay", help="replay your turn history against another computer opponent"
+    )
+    replay_parser.add_argument(
+        "--opponent", default="random", help="random (default) or markov"
+    )
+    replay_parser.add_argument(
+        "--seeds", type=int, default=1000, help="number of seeds to replay with"
+    )
+    replay_parser.add_argument(
+        "--first-seed", type=int, default=0, help="seeds run from this one, upwards"
+    )
+
+    export_parser = commands.add_parser(
+        "export", help="stream game states out, as JSON Lines"
+    )
+    export_parser.add_argument(
+        "state_files",
+        nargs="*",
+        help="state files to export (default: the current game state)",
+    )
+    export_parser.add_argument(
+        "-o", "--output", default="-", help="file to write to, or - for stdout"
+    )
+    export_parser.add_argument(
+        "--chunk-turns",
+        type=int,
+        help="most turns written per line (default: 1000)",
+    )
+
+    import_parser = commands.add_parser(
+        "import", help="stream game states in, from an export"
+    )
+    import_parser.add_argument(
+        "input", nargs="?", default="-", help="file to read, or - for stdin"
+    )
+    import_parser.add_argument(
+        "--output-dir",
+        help="write a state file per user here, instead of restoring the current game",
+    )
+    import_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes used to validate the export (default: validate in-process)",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.move_deadline_ms is not None and args.move_deadline_ms <= 0:
+        parser.error("argument --move-deadline-ms: must be greater than 0")
+
+    # Checked here rather than with `choices`, which would mean importing the
+    # game logic just to parse the arguments
+    if args.strategy is not None:
+        from automata.core.evil_computer import STRATEGIES
+
+        if args.strategy not in STRATEGIES:
+            parser.error(
+                f"argument --strategy: invalid choice: {args.strategy!r} "
+                f"(choose from {', '.join(sorted(STRATEGIES))})"
+            )
+
+    if args.command == "replay":
+        from automata.core.replay import OPPONENTS
+
+        if args.opponent not in OPPONENTS:
+            parser.error(
+                f"argument --opponent: invalid choice: {args.opponent!r} "
+                f"(choose from {', '.join(sorted(OPPONENTS))})"
+            )
+        if args.seeds < 1:
+            parser.error("argument --seeds: must be at least 1")
+
+    return args
+
+
+@contextmanager
+def configured_computer(
+    *, strategy: Optional[str], move_deadline_ms: Optional[float]
+) -> Iterator[None]:
+    """Have the computer play `strategy` inside the block, then report its latency."""
+    # The default computer doesn't need a deadline, or the thread to enforce it
+    if strategy in (None, "random") and move_deadline_ms is None:
+        yield
+        return
+
+    from automata.core.evil_computer import configure_computer
+
+    deadline = move_deadline_ms / 1000 if move_deadline_ms is not None else None
+    runner = configure_computer(strategy or "random", deadline=deadline)
+    try:
+        yield
+    finally:
+        print(runner.report(), file=sys.stderr)
+        runner.close()
+
+
+def run_daemon(*, strategy: Optional[str], move_deadline_ms: Optional[float]) -> None:
+    from automata.core.daemon import serve
+
+    with configured_computer(strategy=strategy, move_deadline_ms=move_deadline_ms):
+        try:
+            serve()
+        except DaemonError as e:
+            print(e)
+            sys.exit(1)
+
+
+def run_replay(
+    *, opponent: str, seeds: int, first_seed: int, daemon: Optional[DaemonClient]
+) -> None:
+    from automata.core.replay import replay, summarize_scores
+    from automata.core.storage import load_game_state
+    from automata.ui.cli import print_replay_summary
+
+    # Have a running daemon write out the game it holds, to replay it as it is now
+    if daemon is not None:
+        daemon.flush()
+
+    game_state = load_game_state()
+    scores = replay(
+        game_state.turn_history,
+        opponent=opponent,
+        seeds=range(first_seed, first_seed + seeds),
+    )
+    summary = summarize_scores(
+        scores,
+        opponent=opponent,
+        actual_score=game_state.score,
+        rounds=len(game_state.turn_history),
+    )
+    print_replay_summary(summary=summary)
+
+
+def run_export(
+    *,
+    state_files: List[str],
+    output: str,
+    chunk_turns: Optional[int],
+    daemon: Optional[DaemonClient],
+) -> None:
+    from automata.core.storage import get_state_file_path
+    from automata.core.transfer import (
+        CHUNK_TURNS,
+        Progress,
+        TransferError,
+        export_states,
+    )
+
+    if not state_files:
+        # Have a running daemon write out the game it holds, to export it as it is now
+        if daemon is not None:
+            daemon.flush()
+        state_files = [get_state_file_path()]
+
+    progress = Progress("Exported", stream=sys.stderr)
+    chunk_turns = chunk_turns or CHUNK_TURNS
 
-def main():
-    setup_logging()
+    try:
+        if output == "-":
+            export_states(
+                state_files, sys.stdout, chunk_turns=chunk_turns, progress=progress
+            )
+        else:
+            with open(output, "w") as file:
+                export_states(
+                    state_files, file, chunk_turns=chunk_turns, progress=progress
+                )
+    except (OSError, TransferError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_import(*, input: str, output_dir: Optional[str], workers: int) -> None:
+    from automata.core.transfer import Progress, TransferError, import_states
+
+    # A running daemon would overwrite the restored state with the one it holds
+    if output_dir is None and DaemonClient.connect() is not None:
+        print("Stop the daemon before restoring the current game.", file=sys.stderr)
+        sys.exit(1)
+
+    progress = Progress("Imported", stream=sys.stderr)
+    try:
+        if input == "-":
+            import_states(
+                sys.stdin, output_dir=output_dir, workers=workers, progress=progress
+            )
+        else:
+            with open(input) as file:
+                import_states(
+                    file, output_dir=output_dir, workers=workers, progress=progress
+                )
+    except (OSError, TransferError) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def play(start_game: Callable[[], None]) -> None:
     try:
         start_game()
     except KeyboardInterrupt:
@@ -24,6 +270,106 @@ def main():
         sys.exit(0)
 
 
+def start_local_game() -> None:
+    from automata.ui.cli import start_game
+
+    start_game()
+
+
+def play_with_daemon(client: DaemonClient) -> None:
+    def start_game() -> None:
+        try:
+            client.start()
+            play_game(client)
+        except (OSError, DaemonError) as e:
+            print(f"\nLost the game daemon ({e}). Use --no-daemon to play without it.")
+            sys.exit(1)
+
+    try:
+        play(start_game)
+    finally:
+        client.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging()
+
+    profiler = nullcontext()
+    if args.profile:
+        from automata.perf.profiling import profile_session
+
+        profiler = profile_session(
+            args.profile,
+            memory=args.profile_memory,
+            sample_interval=args.sample_interval_ms / 1000,
+        )
+
+    with profiler:
+        if args.command == "daemon":
+            run_daemon(strategy=args.strategy, move_deadline_ms=args.move_deadline_ms)
+            return
+
+        if args.command == "import":
+            run_import(
+                input=args.input, output_dir=args.output_dir, workers=args.workers
+            )
+            return
+
+        # Use a running daemon for the game if there is one, otherwise the state file
+        daemon = None if args.no_daemon else DaemonClient.connect()
+
+        if args.command in ("export", "replay"):
+            try:
+                if args.command == "export":
+                    run_export(
+                        state_files=args.state_files,
+                        output=args.output,
+                        chunk_turns=args.chunk_turns,
+                        daemon=daemon,
+                    )
+                else:
+                    run_replay(
+                        opponent=args.opponent,
+                        seeds=args.seeds,
+                        first_seed=args.first_seed,
+                        daemon=daemon,
+                    )
+            finally:
+                if daemon is not None:
+                    daemon.close()
+            return
+
+        if daemon is not None:
+            if args.strategy is not None or args.move_deadline_ms is not None:
+                daemon.close()
+                print(
+                    "The daemon picks the computer's moves - start it with "
+                    "--strategy and --move-deadline-ms, or stop it to play without it.",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+
+            play_with_daemon(daemon)
+            return
+
+        # A running daemon would overwrite the game played without it, like an import
+        if args.no_daemon:
+            running = DaemonClient.connect()
+            if running is not None:
+                running.close()
+                print(
+                    "Stop the daemon before playing without it - it would overwrite "
+                    "the game with the one it holds.",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+
+        with configured_computer(
+            strategy=args.strategy, move_deadline_ms=args.move_deadline_ms
+        ):
+            play(start_local_game)
+
+
 if __name__ == "__main__":
     main()
-
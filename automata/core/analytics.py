@@ -0,0 +1,130 @@
+"""
+Exact odds for upcoming rounds, worked out from the game rules.
+
+Given how often the player and the computer pick each option, every round is
+an independent win / lose / tie with fixed probabilities. Score distributions
+over N rounds follow by dynamic programming, so there's no need to simulate.
+"""
+
+from collections import Counter
+from functools import lru_cache
+from math import comb
+from typing import Dict, Mapping, NamedTuple, Sequence, Tuple
+
+from automata.core.rules import GAME_RULES, TURN_OPTIONS
+from automata.models import TurnOption
+
+# Probability of each option, in `TURN_OPTIONS` order
+MoveDistribution = Tuple[float, ...]
+
+UNIFORM_DISTRIBUTION: MoveDistribution = (1 / len(TURN_OPTIONS),) * len(TURN_OPTIONS)
+
+
+class RoundProbabilities(NamedTuple):
+    win: float
+    lose: float
+    tie: float
+
+
+def get_move_distribution(turn_history: Sequence[TurnOption]) -> MoveDistribution:
+    """How often the player has picked each option, or uniform with no history."""
+    return get_count_distribution(Counter(turn_history))
+
+
+def get_count_distribution(counts: Mapping[TurnOption, int]) -> MoveDistribution:
+    """The distribution of moves counted in `counts`, or uniform if there are none."""
+    total = sum(counts.values())
+    if not total:
+        return UNIFORM_DISTRIBUTION
+
+    return tuple(counts.get(option, 0) / total for option in TURN_OPTIONS)
+
+
+def get_round_probabilities(
+    player: MoveDistribution, computer: MoveDistribution = UNIFORM_DISTRIBUTION
+) -> RoundProbabilities:
+    """Chances of the player winning, losing or tying a single round."""
+    win = lose = tie = 0.0
+    for player_option, player_chance in zip(TURN_OPTIONS, player):
+        for computer_option, computer_chance in zip(TURN_OPTIONS, computer):
+            chance = player_chance * computer_chance
+            if player_option == computer_option:
+                tie += chance
+            elif computer_option in GAME_RULES[player_option]:
+                win += chance
+            else:
+                lose += chance
+
+    return RoundProbabilities(win=win, lose=lose, tie=tie)
+
+
+def _cache_key(probabilities: RoundProbabilities) -> RoundProbabilities:
+    # Distributions worked out from the same counts can differ in the last bits
+    return RoundProbabilities(*(round(chance, 12) for chance in probabilities))
+
+
+@lru_cache(maxsize=256)
+def _score_distribution(
+    probabilities: RoundProbabilities, rounds: int
+) -> Tuple[float, ...]:
+    win, lose, tie = probabilities
+    # distribution[i] is the chance of the score changing by i - rounds
+    distribution = [0.0] * (2 * rounds + 1)
+    distribution[rounds] = 1.0
+
+    for _ in range(rounds):
+        padded = [0.0, *distribution, 0.0]
+        distribution = [
+            tie * same + win * one_less + lose * one_more
+            for one_less, same, one_more in zip(padded, padded[1:], padded[2:])
+        ]
+
+    return tuple(distribution)
+
+
+def get_score_distribution(
+    probabilities: RoundProbabilities, rounds: int
+) -> Dict[int, float]:
+    """Chance of each possible change in score, over the next `rounds` rounds."""
+    distribution = _score_distribution(_cache_key(probabilities), rounds)
+    return {
+        change - rounds: chance
+        for change, chance in enumerate(distribution)
+        if chance > 0
+    }
+
+
+def get_probability_ahead(
+    probabilities: RoundProbabilities, *, rounds: int, score: int = 0
+) -> float:
+    """Chance of the player's score being above zero after `rounds` more rounds."""
+    distribution = _score_distribution(_cache_key(probabilities), rounds)
+    return sum(
+        chance
+        for change, chance in enumerate(distribution)
+        if score + change - rounds > 0
+    )
+
+
+@lru_cache(maxsize=256)
+def _best_of_probability(probabilities: RoundProbabilities, games: int) -> float:
+    win, lose, _ = probabilities
+    if win + lose == 0:
+        return 0.0
+
+    # Ties are replayed, so only decisive rounds count towards the match
+    p = win / (win + lose)
+    needed = games // 2 + 1
+    return sum(
+        comb(needed - 1 + losses, losses) * p**needed * (1 - p) ** losses
+        for losses in range(needed)
+    )
+
+
+def get_best_of_probability(probabilities: RoundProbabilities, games: int) -> float:
+    """
+    Chance of the player winning a best-of-`games` match - the first to win
+    a majority of `games` rounds, with tied rounds replayed.
+    A match where every round is a tie never ends, so can't be won.
+    """
+    return _best_of_probability(_cache_key(probabilities), games)
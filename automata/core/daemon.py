@@ -0,0 +1,205 @@
+"""
+Optional long-lived game daemon.
+
+The daemon holds the game in memory and plays it: clients send moves and get
+back only what the screen needs, so they skip loading pydantic and parsing the
+state file on start up. The state file is written in the background, with
+saves coalesced, and flushed when the daemon stops.
+
+Protocol: one request per line, `<op>[ <argument>]\\n`, answered by one line of
+`ok[ <json>]\\n` or `error <message>\\n`. The ops are:
+
+- `start` - start a session, which undo can't go back past
+- `play <move>`, `undo`, `checkpoint`, `rewind`, `restart`
+- `log_in <json username>`, `set_username <json username>`
+- `flush` - write the game state to the state file now
+- `ping`
+
+Game ops reply with `{"scoreboard": {...}}`, plus a `message` to show the
+player for moves, undo, checkpoint and rewind.
+"""
+
+import json
+import os
+import signal
+import socketserver
+import threading
+import traceback
+from os import path
+from typing import Any, Dict, Optional, cast
+
+from automata.core import storage
+from automata.core.daemon_client import DaemonClient, DaemonError, get_socket_path
+from automata.core.rules import TURN_OPTIONS
+from automata.core.session import GameSession
+from automata.logging import get_logger
+from automata.models import InternalGameState, TurnOption
+
+logger = get_logger("daemon")
+
+
+class StateDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Plays the game for its clients, and persists it in the background."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Optional[str] = None):
+        self.socket_path = socket_path or get_socket_path()
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = False
+        self._wake = threading.Event()
+        self._stopping = False
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+
+        self.session = GameSession(storage.load_game_state(), save=self._mark_changed)
+
+        remove_stale_socket(self.socket_path)
+        super().__init__(self.socket_path, DaemonRequestHandler)
+        self._writer.start()
+
+    def _mark_changed(self, *, game_state: InternalGameState) -> None:
+        # Called by the session, under `_lock`, whenever the game changes
+        self._pending = True
+        self._wake.set()
+
+    def handle_line(self, line: str) -> str:
+        op, _, argument = line.partition(" ")
+
+        if op == "ping":
+            return "ok"
+
+        if op == "flush":
+            self.flush()
+            return "ok"
+
+        with self._lock:
+            try:
+                reply = self._play(op, argument)
+            except ValueError as e:
+                return f"error {e}"
+
+            reply["scoreboard"] = self.session.scoreboard().to_dict()
+
+        return "ok " + json.dumps(reply, separators=(",", ":"))
+
+    def _play(self, op: str, argument: str) -> Dict[str, Any]:
+        session = self.session
+
+        if op == "start":
+            self.session = GameSession(session.game_state, save=self._mark_changed)
+            return {}
+
+        if op == "play":
+            if argument not in TURN_OPTIONS:
+                raise ValueError(f"invalid move {argument!r}")
+            return {"message": session.play(cast(TurnOption, argument))}
+
+        if op == "undo":
+            return {"message": session.undo()}
+
+        if op == "checkpoint":
+            return {"message": session.checkpoint()}
+
+        if op == "rewind":
+            return {"message": session.rewind()}
+
+        if op == "restart":
+            session.restart()
+            return {}
+
+        if op in ("log_in", "set_username"):
+            try:
+                username = json.loads(argument)
+            except json.JSONDecodeError:
+                username = None
+            if not isinstance(username, str) or not username:
+                raise ValueError("invalid username")
+
+            if op == "log_in":
+                session.log_in(username)
+            else:
+                session.set_username(username)
+            return {}
+
+        raise ValueError(f"unknown op {op!r}")
+
+    def flush(self) -> None:
+        """Write the latest game state to disk, if it changed since the last write."""
+        with self._write_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._pending = False
+                # Moves update the history in place, so write a copy of it
+                game_state = self.session.game_state.model_copy(
+                    update={"turn_history": list(self.session.game_state.turn_history)}
+                )
+
+            storage.save_game_state(game_state=game_state)
+
+    def _write_loop(self) -> None:
+        # Saves are coalesced - only the latest state is ever written
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopping:
+                return
+            self.flush()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._stopping = True
+        self._wake.set()
+        if self._writer.is_alive():
+            self._writer.join()
+        self.flush()
+        if path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    server: StateDaemon
+
+    def handle(self) -> None:
+        for raw_line in self.rfile:
+            try:
+                response = self.server.handle_line(raw_line.decode().rstrip("\n"))
+            except Exception:
+                logger.error(f"Unexpected error in daemon. {traceback.format_exc()}")
+                response = "error unexpected error"
+
+            self.wfile.write(response.encode() + b"\n")
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """Remove a socket left behind by a daemon that is no longer running."""
+    if not path.exists(socket_path):
+        return
+
+    client = DaemonClient.connect(socket_path)
+    if client is not None:
+        client.close()
+        raise DaemonError(f"A daemon is already listening on {socket_path}")
+
+    os.unlink(socket_path)
+
+
+def _stop(signum, frame) -> None:
+    # Unwinds out of serve_forever, so the server is closed and flushed
+    raise SystemExit(0)
+
+
+def serve(socket_path: Optional[str] = None) -> None:
+    """Run the daemon in the foreground, until interrupted or terminated."""
+    previous_handler = signal.signal(signal.SIGTERM, _stop)
+    try:
+        with StateDaemon(socket_path) as server:
+            print(f"automata daemon listening on {server.socket_path}", flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
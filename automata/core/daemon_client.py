@@ -0,0 +1,105 @@
+"""
+Client for the game daemon - see `automata.core.daemon`.
+
+The daemon plays every move, and only sends back what the screen needs. So
+this, and all a client imports with it - `__main__`, `ui.screen` and
+`core.scoreboard` - only uses the standard library, and a client starts without
+loading pydantic or the game logic.
+"""
+
+import json
+import socket
+import tempfile
+from os import path
+from typing import Any, Dict, Optional
+
+from automata.core.scoreboard import Scoreboard
+
+
+class DaemonError(Exception):
+    """Raised when the daemon rejects a request."""
+
+
+def get_socket_path() -> str:
+    return path.join(tempfile.gettempdir(), "automata-daemon.sock")
+
+
+class DaemonClient:
+    """A connection to a running daemon, playing the game it holds."""
+
+    def __init__(self, sock: socket.socket):
+        self._socket = sock
+        self._file = sock.makefile("rwb")
+        self._scoreboard: Optional[Scoreboard] = None
+
+    @classmethod
+    def connect(cls, socket_path: Optional[str] = None) -> Optional["DaemonClient"]:
+        """Connect to the daemon, or return None if there isn't one running."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(socket_path or get_socket_path())
+        except OSError:
+            sock.close()
+            return None
+
+        return cls(sock)
+
+    def request(self, op: str, argument: str = "") -> Optional[Dict[str, Any]]:
+        """Send one request, and return the daemon's reply, if it has one."""
+        line = f"{op} {argument}" if argument else op
+        self._file.write(line.encode() + b"\n")
+        self._file.flush()
+
+        response = self._file.readline().decode().rstrip("\n")
+        if not response:
+            raise ConnectionError("Daemon closed the connection")
+
+        status, _, body = response.partition(" ")
+        if status != "ok":
+            raise DaemonError(body)
+
+        return json.loads(body) if body else None
+
+    def _update(self, op: str, argument: str = "") -> Dict[str, Any]:
+        reply = self.request(op, argument) or {}
+        self._scoreboard = Scoreboard.from_dict(reply["scoreboard"])
+        return reply
+
+    def start(self) -> Scoreboard:
+        """Start a new session of the daemon's game - undo stops here."""
+        self._update("start")
+        return self.scoreboard()
+
+    def scoreboard(self) -> Scoreboard:
+        if self._scoreboard is None:
+            return self.start()
+        return self._scoreboard
+
+    def play(self, move: str) -> str:
+        return self._update("play", move)["message"]
+
+    def undo(self) -> str:
+        return self._update("undo")["message"]
+
+    def checkpoint(self) -> str:
+        return self._update("checkpoint")["message"]
+
+    def rewind(self) -> str:
+        return self._update("rewind")["message"]
+
+    def restart(self) -> None:
+        self._update("restart")
+
+    def log_in(self, username: Optional[str]) -> None:
+        self._update("log_in", json.dumps(username))
+
+    def set_username(self, username: str) -> None:
+        self._update("set_username", json.dumps(username))
+
+    def flush(self) -> None:
+        """Have the daemon write its game state to the state file now."""
+        self.request("flush")
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
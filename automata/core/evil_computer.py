@@ -1,10 +1,300 @@
 import random
-from typing import List
+import statistics
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
 
+from automata.core.analytics import UNIFORM_DISTRIBUTION, MoveDistribution
+from automata.core.rules import TURN_OPTIONS, get_counter_moves
+from automata.logging import get_logger
 from automata.models import TurnOption
 
+logger = get_logger("computer")
+
+Strategy = Callable[[Sequence[TurnOption]], TurnOption]
+
+# Set by `configure_computer`. Without it, the computer just picks at random
+_runner: Optional["StrategyRunner"] = None
+
+
+def get_computer_choice(history: Sequence[TurnOption] = ()) -> TurnOption:
+    """Generate a choice for the computer, given the player's moves so far."""
+    if _runner is not None:
+        return _runner.choose(history)
 
-def get_computer_choice() -> TurnOption:
-    """Generate a random choice for the computer."""
     options: List[TurnOption] = ["rock", "paper", "scissors", "lizard", "spock"]
     return random.choice(options)
+
+
+def prefetch_computer_choice(history: Sequence[TurnOption]) -> None:
+    """Start working out the computer's next choice, while the player thinks."""
+    if _runner is not None:
+        _runner.prefetch(history)
+
+
+class MarkovPredictor:
+    """Predicts the player's next move, from the moves that followed their last one."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.moves: Counter = Counter()
+        self.transitions: Dict[TurnOption, Counter] = {}
+        self.last_move: Optional[TurnOption] = None
+        self._followed: Optional[List[TurnOption]] = None
+        self._observed = 0
+
+    def observe(self, move: TurnOption) -> None:
+        self.moves[move] += 1
+        if self.last_move is not None:
+            self.transitions.setdefault(self.last_move, Counter())[move] += 1
+        self.last_move = move
+
+    def follow(self, history: List[TurnOption]) -> None:
+        """
+        Observe the moves added to `history` since the last call. The list is
+        expected to only grow in place - any other list is observed from scratch.
+        """
+        if history is not self._followed or len(history) < self._observed:
+            self.reset()
+            self._followed = history
+
+        for move in history[self._observed :]:
+            self.observe(move)
+        self._observed = len(history)
+
+    def predict(self) -> Optional[TurnOption]:
+        """The player's most likely next move, or None if there's nothing to go on."""
+        if self.last_move is None or self.last_move not in self.transitions:
+            return None
+        return self.transitions[self.last_move].most_common(1)[0][0]
+
+    def counter_move(self) -> Optional[TurnOption]:
+        """A move that beats the player's most likely next move."""
+        prediction = self.predict()
+        return get_counter_moves(prediction)[0] if prediction else None
+
+
+def random_strategy(history: Sequence[TurnOption]) -> TurnOption:
+    return random.choice(TURN_OPTIONS)
+
+
+def markov_strategy(history: Sequence[TurnOption]) -> TurnOption:
+    predictor = MarkovPredictor()
+    for move in history:
+        predictor.observe(move)
+    return predictor.counter_move() or random_strategy(history)
+
+
+def markov_distribution(predictor: MarkovPredictor) -> MoveDistribution:
+    """
+    How often `markov_strategy` picks each option over the coming rounds, if the
+    player keeps picking each move as often as they have so far.
+    """
+    if not predictor.transitions:
+        return UNIFORM_DISTRIBUTION
+
+    total = sum(predictor.moves.values())
+    chances = dict.fromkeys(TURN_OPTIONS, 0.0)
+    for move, count in predictor.moves.items():
+        follow_ups = predictor.transitions.get(move)
+        if follow_ups:
+            prediction = follow_ups.most_common(1)[0][0]
+            chances[get_counter_moves(prediction)[0]] += count / total
+        else:
+            # Nothing to predict from after this move, so the strategy picks at random
+            for option in TURN_OPTIONS:
+                chances[option] += count / total / len(TURN_OPTIONS)
+
+    return tuple(chances[option] for option in TURN_OPTIONS)
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "random": random_strategy,
+    "markov": markov_strategy,
+}
+
+# How each strategy's picks are distributed, for those that don't pick at random
+STRATEGY_DISTRIBUTIONS: Dict[str, Callable[[MarkovPredictor], MoveDistribution]] = {
+    "markov": markov_distribution,
+}
+
+
+def get_computer_distribution(
+    predictor: MarkovPredictor,
+) -> Optional[MoveDistribution]:
+    """
+    How often the computer in play will pick each option, given what
+    `predictor` has seen of the player. None if it picks at random.
+    """
+    if _runner is None or _runner.strategy_name not in STRATEGY_DISTRIBUTIONS:
+        return None
+
+    distribution = STRATEGY_DISTRIBUTIONS[_runner.strategy_name](predictor)
+    return None if distribution == UNIFORM_DISTRIBUTION else distribution
+
+
+@dataclass
+class StrategyStats:
+    """
+    Timings of a strategy, in seconds. `latencies` is how long each move kept
+    the player waiting, and `compute_times` how long the strategy itself took
+    each time it ran, including prefetches.
+    """
+
+    latencies: List[float] = field(default_factory=list)
+    compute_times: List[float] = field(default_factory=list)
+    deadline_misses: int = 0
+    errors: int = 0
+
+    def summary(self) -> Dict[str, float]:
+        waits = sorted(self.latencies) or [0.0]
+        computes = sorted(self.compute_times) or [0.0]
+        return {
+            "moves": len(self.latencies),
+            "deadline_misses": self.deadline_misses,
+            "errors": self.errors,
+            "mean_ms": statistics.fmean(waits) * 1000,
+            "p95_ms": _percentile(waits, 95) * 1000,
+            "max_ms": waits[-1] * 1000,
+            "computed": len(self.compute_times),
+            "compute_mean_ms": statistics.fmean(computes) * 1000,
+            "compute_p95_ms": _percentile(computes, 95) * 1000,
+            "compute_max_ms": computes[-1] * 1000,
+        }
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    return sorted_values[round((len(sorted_values) - 1) * percent / 100)]
+
+
+class StrategyRunner:
+    """
+    Runs a strategy with a deadline for each move. A strategy that misses it,
+    or fails, is replaced by the fallback for that move.
+
+    A running strategy can't be cancelled, so work is never queued behind it:
+    a move only starts on a free worker, and when every worker is still busy
+    with a stale prefetch or an overrunning move, the fallback is used at once.
+    """
+
+    def __init__(
+        self,
+        strategy: str,
+        *,
+        deadline: Optional[float] = None,
+        fallback: str = "random",
+        workers: int = 2,
+    ):
+        self.strategy_name = strategy
+        self.strategy = STRATEGIES[strategy]
+        self.deadline = deadline
+        self.fallback = STRATEGIES[fallback]
+        self.stats = StrategyStats()
+
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="computer"
+        )
+        self._running: Set[Future] = set()
+        self._prefetched: Optional[Tuple[Tuple[TurnOption, ...], Future]] = None
+
+    def prefetch(self, history: Sequence[TurnOption]) -> None:
+        """Start working out the move for `history`, if a worker is free."""
+        history = tuple(history)
+        future = self._submit(history)
+        self._prefetched = (history, future) if future is not None else None
+
+    def choose(self, history: Sequence[TurnOption]) -> TurnOption:
+        history = tuple(history)
+        started_at = time.perf_counter()
+        choice = self._run(history)
+        self.stats.latencies.append(time.perf_counter() - started_at)
+        return choice
+
+    def _compute(self, history: Tuple[TurnOption, ...]) -> TurnOption:
+        started_at = time.perf_counter()
+        try:
+            return self.strategy(history)
+        finally:
+            self.stats.compute_times.append(time.perf_counter() - started_at)
+
+    def _submit(self, history: Tuple[TurnOption, ...]) -> Optional[Future]:
+        """Start the strategy on a free worker, or return None if all are busy."""
+        if len(self._running) >= self.workers:
+            return None
+
+        future = self._executor.submit(self._compute, history)
+        self._running.add(future)
+        future.add_done_callback(self._running.discard)
+        return future
+
+    def _run(self, history: Tuple[TurnOption, ...]) -> TurnOption:
+        prefetched, self._prefetched = self._prefetched, None
+        try:
+            # A prefetch for a different history, e.g. from before an undo,
+            # is left to finish on its own worker
+            if prefetched is not None and prefetched[0] == history:
+                return prefetched[1].result(timeout=self.deadline)
+
+            if self.deadline is None:
+                return self._compute(history)
+
+            future = self._submit(history)
+            if future is None:
+                self.stats.deadline_misses += 1
+                logger.warning(
+                    f"{self.strategy_name} strategy is still busy with earlier moves, "
+                    "falling back"
+                )
+                return self.fallback(history)
+
+            return future.result(timeout=self.deadline)
+        except FutureTimeoutError:
+            self.stats.deadline_misses += 1
+            logger.warning(
+                f"{self.strategy_name} strategy missed its {self.deadline}s deadline, "
+                "falling back"
+            )
+        except Exception:
+            self.stats.errors += 1
+            logger.error(
+                f"{self.strategy_name} strategy failed, falling back. "
+                f"{traceback.format_exc()}"
+            )
+
+        return self.fallback(history)
+
+    def report(self) -> str:
+        summary = self.stats.summary()
+        return (
+            f"{self.strategy_name} strategy: {summary['moves']:.0f} moves, "
+            f"waited mean {summary['mean_ms']:.2f}ms, p95 {summary['p95_ms']:.2f}ms, "
+            f"max {summary['max_ms']:.2f}ms; "
+            f"computed {summary['computed']:.0f} times, "
+            f"mean {summary['compute_mean_ms']:.2f}ms, "
+            f"p95 {summary['compute_p95_ms']:.2f}ms, "
+            f"max {summary['compute_max_ms']:.2f}ms; "
+            f"{summary['deadline_misses']:.0f} deadline misses, "
+            f"{summary['errors']:.0f} errors"
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def configure_computer(
+    strategy: str = "random", *, deadline: Optional[float] = None
+) -> StrategyRunner:
+    """Have the computer play `strategy`, with at most `deadline` seconds per move."""
+    global _runner
+    if _runner is not None:
+        _runner.close()
+
+    _runner = StrategyRunner(strategy, deadline=deadline)
+    return _runner
@@ -1,18 +1,10 @@
-from typing import Dict, List, Tuple
+from typing import Callable, List, Optional, Tuple
 
-from automata.core.evil_computer import get_computer_choice
+from automata.core.evil_computer import get_computer_choice, prefetch_computer_choice
+from automata.core.rules import GAME_RULES
 from automata.core.storage import save_game_state
 from automata.models import InternalGameState, TurnOption, TurnResult
 
-# Defines the rules of the game - which option beats which
-GAME_RULES: Dict[TurnOption, List[TurnOption]] = {
-    "rock": ["scissors", "lizard"],
-    "paper": ["rock", "spock"],
-    "scissors": ["paper", "lizard"],
-    "lizard": ["paper", "spock"],
-    "spock": ["scissors", "rock"],
-}
-
 
 def get_outcome_reason(*, winner: TurnOption, loser: TurnOption) -> str:
     """Get the reason for the outcome based on winner and loser choices."""
@@ -79,9 +71,15 @@ def determine_turn_outcome(
 
 
 def play_turn(
-    *, player_choice: TurnOption, game_state: InternalGameState
+    *,
+    player_choice: TurnOption,
+    game_state: InternalGameState,
+    save: Optional[Callable[..., None]] = None,
 ) -> Tuple[TurnResult, InternalGameState]:
-    """Play a turn and update the game state."""
+    """
+    Play a turn and update the game state.
+    The new state is saved with `save`, or `save_game_state` by default.
+    """
 
     if not is_valid_turn(player_choice=player_choice):
         return TurnResult(
@@ -92,7 +90,7 @@ def play_turn(
         ), game_state
 
     # Get the computer's choice
-    computer_choice = get_computer_choice()
+    computer_choice = get_computer_choice(game_state.turn_history)
 
     # Determine the outcome
     result = determine_turn_outcome(
@@ -109,6 +107,9 @@ def play_turn(
         game_state.score -= 1
 
     # Save the updated game state
-    save_game_state(game_state=game_state)
+    (save or save_game_state)(game_state=game_state)
+
+    # Let the computer think about its next move, while the player thinks about theirs
+    prefetch_computer_choice(game_state.turn_history)
 
     return result, game_state
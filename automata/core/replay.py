@@ -0,0 +1,178 @@
+"""
+Replay a player's turn history against other computer opponents.
+
+The history is encoded once, as one byte per turn. Opponent move streams are
+scored in batches: player and computer codes are combined with a single
+big-integer addition, and outcomes looked up with `bytes.translate`. Every
+per-turn step runs in C, so thousands of streams are scored without a Python
+loop per turn.
+"""
+
+import random
+import statistics
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence
+
+from automata.core.evil_computer import MarkovPredictor
+from automata.core.rules import GAME_RULES, TURN_OPTIONS
+from automata.models import ReplaySummary, TurnOption
+
+OPTION_CODES: Dict[TurnOption, int] = {
+    option: code for code, option in enumerate(TURN_OPTIONS)
+}
+
+# Outcome codes, from the player's point of view
+TIE, WIN, LOSE = 0, 1, 2
+
+# Maps `player code * 5 + computer code` to the outcome for the player
+OUTCOME_TABLE = bytes(
+    WIN
+    if computer in GAME_RULES[player]
+    else LOSE
+    if player in GAME_RULES[computer]
+    else TIE
+    for player in TURN_OPTIONS
+    for computer in TURN_OPTIONS
+).ljust(256, b"\0")
+
+# Maps random bytes to option codes. Bytes >= 250 are dropped to avoid modulo bias
+_UNIFORM_CODES = bytes(byte % len(TURN_OPTIONS) for byte in range(256))
+_UNIFORM_REJECT = bytes(range(250, 256))
+
+# Roughly how many turns to score at once - bounds memory for long histories
+BATCH_TURNS = 1 << 20
+
+
+def encode_moves(moves: Iterable[TurnOption]) -> bytes:
+    return bytes(OPTION_CODES[move] for move in moves)
+
+
+class EncodedHistory:
+    """A player's turn history, prepared for scoring against many opponents."""
+
+    def __init__(self, turn_history: Sequence[TurnOption]):
+        self.moves = encode_moves(turn_history)
+        self.rounds = len(self.moves)
+        # Player codes pre-multiplied, ready to add computer codes to
+        self._scaled_moves = self.moves.translate(
+            bytes(byte * len(TURN_OPTIONS) % 256 for byte in range(256))
+        )
+
+    def outcomes(self, opponents: Sequence[bytes]) -> bytes:
+        """Outcome codes for each turn of each opponent stream, concatenated."""
+        for opponent in opponents:
+            if len(opponent) != self.rounds:
+                raise ValueError(
+                    f"Opponent played {len(opponent)} moves, expected {self.rounds}"
+                )
+
+        computer_moves = b"".join(opponents)
+        player_moves = self._scaled_moves * len(opponents)
+
+        # Each byte sums to at most 24, so the addition never carries between turns
+        pairs = int.from_bytes(player_moves, "little") + int.from_bytes(
+            computer_moves, "little"
+        )
+        return pairs.to_bytes(len(computer_moves), "little").translate(OUTCOME_TABLE)
+
+    def scores(self, opponents: Sequence[bytes]) -> List[int]:
+        """The player's final score against each opponent stream."""
+        outcomes = self.outcomes(opponents)
+        scores = []
+        for start in range(0, len(outcomes), self.rounds or 1):
+            game = outcomes[start : start + self.rounds]
+            scores.append(game.count(WIN) - game.count(LOSE))
+        return scores or [0] * len(opponents)
+
+    def score(self, opponent: bytes) -> int:
+        return self.scores([opponent])[0]
+
+
+def random_opponents(history: EncodedHistory, seeds: Iterable[int]) -> Iterator[bytes]:
+    """The computer picking uniformly at random, with one stream per seed."""
+    for seed in seeds:
+        rng = random.Random(seed)
+        moves = b""
+        while len(moves) < history.rounds:
+            needed = history.rounds - len(moves)
+            moves += rng.randbytes(needed + needed // 32 + 8).translate(
+                _UNIFORM_CODES, _UNIFORM_REJECT
+            )
+        yield moves[: history.rounds]
+
+
+def markov_opponents(history: EncodedHistory, seeds: Iterable[int]) -> Iterator[bytes]:
+    """
+    The computer countering the player's predicted next move - see `MarkovPredictor`.
+    Predictions only depend on the history, so they are worked out once. Seeds
+    pick the moves on turns where there's no prediction to go on.
+    """
+    predictor = MarkovPredictor()
+    template = bytearray(history.rounds)
+    unpredicted: List[int] = []
+
+    for turn, code in enumerate(history.moves):
+        move = predictor.counter_move()
+        if move is None:
+            unpredicted.append(turn)
+        else:
+            template[turn] = OPTION_CODES[move]
+        predictor.observe(TURN_OPTIONS[code])
+
+    for seed in seeds:
+        rng = random.Random(seed)
+        moves = bytearray(template)
+        for turn in unpredicted:
+            moves[turn] = rng.randrange(len(TURN_OPTIONS))
+        yield bytes(moves)
+
+
+OPPONENTS: Dict[str, Callable[[EncodedHistory, Iterable[int]], Iterator[bytes]]] = {
+    "random": random_opponents,
+    "markov": markov_opponents,
+}
+
+
+def replay(
+    turn_history: Sequence[TurnOption], *, opponent: str, seeds: Iterable[int]
+) -> List[int]:
+    """Replay the player's moves against `opponent`, with one final score per seed."""
+    history = EncodedHistory(turn_history)
+    streams = OPPONENTS[opponent](history, seeds)
+    batch_size = max(1, BATCH_TURNS // max(history.rounds, 1))
+
+    scores: List[int] = []
+    batch: List[bytes] = []
+    for stream in streams:
+        batch.append(stream)
+        if len(batch) == batch_size:
+            scores += history.scores(batch)
+            batch = []
+    if batch:
+        scores += history.scores(batch)
+
+    return scores
+
+
+def summarize_scores(
+    scores: Sequence[int], *, opponent: str, actual_score: int, rounds: int
+) -> ReplaySummary:
+    ordered = sorted(scores)
+
+    def percentile(percent: int) -> int:
+        return ordered[round((len(ordered) - 1) * percent / 100)]
+
+    return ReplaySummary(
+        opponent=opponent,
+        rounds=rounds,
+        seeds=len(ordered),
+        actual_score=actual_score,
+        mean=statistics.fmean(ordered),
+        stdev=statistics.pstdev(ordered),
+        minimum=ordered[0],
+        p5=percentile(5),
+        median=percentile(50),
+        p95=percentile(95),
+        maximum=ordered[-1],
+        better_than_actual=sum(score > actual_score for score in ordered)
+        / len(ordered),
+    )
@@ -0,0 +1,19 @@
+from typing import Dict, List
+
+from automata.models import TurnOption
+
+# Defines the rules of the game - which option beats which
+GAME_RULES: Dict[TurnOption, List[TurnOption]] = {
+    "rock": ["scissors", "lizard"],
+    "paper": ["rock", "spock"],
+    "scissors": ["paper", "lizard"],
+    "lizard": ["paper", "spock"],
+    "spock": ["scissors", "rock"],
+}
+
+TURN_OPTIONS: List[TurnOption] = list(GAME_RULES)
+
+
+def get_counter_moves(move: TurnOption) -> List[TurnOption]:
+    """Get the options that beat the given move."""
+    return [option for option in TURN_OPTIONS if move in GAME_RULES[option]]
@@ -0,0 +1,37 @@
+"""What the game screen shows between turns."""
+
+from typing import Any, Dict, NamedTuple, Optional
+
+
+class Odds(NamedTuple):
+    """The player's chances against the computer in play, if they play as before."""
+
+    rounds: int
+    ahead: float
+    best_of: int
+    win_best_of: float
+
+
+class Scoreboard(NamedTuple):
+    username: Optional[str]
+    score: int
+    rounds: int
+    odds: Optional[Odds] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "username": self.username,
+            "score": self.score,
+            "rounds": self.rounds,
+            "odds": self.odds._asdict() if self.odds else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Scoreboard":
+        odds = data.get("odds")
+        return cls(
+            username=data["username"],
+            score=data["score"],
+            rounds=data["rounds"],
+            odds=Odds(**odds) if odds else None,
+        )
@@ -0,0 +1,128 @@
+from typing import Callable, Optional
+
+from automata.core.analytics import (
+    get_best_of_probability,
+    get_count_distribution,
+    get_probability_ahead,
+    get_round_probabilities,
+)
+from automata.core.evil_computer import MarkovPredictor, get_computer_distribution
+from automata.core.game import play_turn
+from automata.core.scoreboard import Odds, Scoreboard
+from automata.core.storage import save_game_state
+from automata.core.timeline import GameTimeline
+from automata.models import InternalGameState, TurnOption
+
+# How far ahead the odds on the scoreboard look
+PROJECTION_ROUNDS = 10
+PROJECTION_BEST_OF = 5
+
+
+def get_odds(
+    *, game_state: InternalGameState, predictor: MarkovPredictor
+) -> Optional[Odds]:
+    """
+    The player's odds against the computer in play, if they keep playing as
+    before. Against a computer that picks at random, every way of playing has
+    the same odds, so there are none worth showing.
+    """
+    predictor.follow(game_state.turn_history)
+    computer = get_computer_distribution(predictor)
+    if computer is None:
+        return None
+
+    probabilities = get_round_probabilities(
+        get_count_distribution(predictor.moves), computer
+    )
+    return Odds(
+        rounds=PROJECTION_ROUNDS,
+        ahead=get_probability_ahead(
+            probabilities, rounds=PROJECTION_ROUNDS, score=game_state.score
+        ),
+        best_of=PROJECTION_BEST_OF,
+        win_best_of=get_best_of_probability(probabilities, PROJECTION_BEST_OF),
+    )
+
+
+class GameSession:
+    """
+    A player's game in progress - the game logic behind the screen, including
+    undo and checkpoints. Every change is saved with `save`, which writes the
+    state file by default.
+    """
+
+    def __init__(
+        self,
+        game_state: InternalGameState,
+        *,
+        save: Optional[Callable[..., None]] = None,
+    ):
+        self.game_state = game_state
+        self.timeline = GameTimeline(game_state)
+        # Keeps running counts of the player's moves, for the odds
+        self.predictor = MarkovPredictor()
+        self._save = save
+
+    def _store(self, game_state: InternalGameState) -> None:
+        self.game_state = game_state
+        (self._save or save_game_state)(game_state=game_state)
+
+    def scoreboard(self) -> Scoreboard:
+        return Scoreboard(
+            username=self.game_state.username,
+            score=self.game_state.score,
+            rounds=len(self.game_state.turn_history),
+            odds=get_odds(game_state=self.game_state, predictor=self.predictor),
+        )
+
+    def play(self, move: TurnOption) -> str:
+        """Play a turn, and return the result to show the player."""
+        result, self.game_state = play_turn(
+            player_choice=move, game_state=self.game_state, save=self._save
+        )
+        self.timeline.record(self.game_state)
+
+        return (
+            f"      Your choice: {result.player_choice}\n"
+            f"Computer's choice: {result.computer_choice}\n\n"
+            f"{result.reason}"
+        )
+
+    def undo(self) -> str:
+        """Undo the last move played in this session"""
+        if self.timeline.head.undoable_moves == 0:
+            return "Nothing to undo. What's done is done."
+
+        self._store(self.timeline.undo())
+        return "Fine. Let's pretend that never happened."
+
+    def checkpoint(self) -> str:
+        """Mark the current state, so the player can come back to it"""
+        self.timeline.checkpoint()
+        return (
+            f"Checkpoint saved at round {self.timeline.head.rounds}. "
+            "Hedging your bets, are we?"
+        )
+
+    def rewind(self) -> str:
+        """Go back to the most recent checkpoint"""
+        game_state = self.timeline.rewind()
+        if game_state is None:
+            return "No checkpoint to go back to."
+
+        self._store(game_state)
+        return f"Back to round {len(game_state.turn_history)}. Try again."
+
+    def restart(self) -> None:
+        """Restart the game with a fresh state, but same user"""
+        self.log_in(self.game_state.username)
+
+    def log_in(self, username: Optional[str]) -> None:
+        """Start a fresh game as `username`"""
+        self._store(InternalGameState(username=username, score=0, turn_history=[]))
+        self.timeline = GameTimeline(self.game_state)
+
+    def set_username(self, username: str) -> None:
+        """Name the player of the current game"""
+        self._store(self.game_state.model_copy(update={"username": username}))
+        self.timeline = GameTimeline(self.game_state)
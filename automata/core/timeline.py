@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from automata.models import InternalGameState, TurnOption
+
+
+@dataclass(frozen=True, eq=False)
+class Snapshot:
+    """
+    An immutable point in a game session.
+
+    Each snapshot only stores the turn that led to it and a pointer to its parent,
+    so taking one is O(1) and every branch shares the history it has in common.
+    The history loaded at the start of the session is kept once, in `base_history`.
+    """
+
+    username: Optional[str]
+    score: int
+    rounds: int
+    turn: Optional[TurnOption] = None
+    parent: Optional["Snapshot"] = None
+    base_history: Tuple[TurnOption, ...] = ()
+
+    @classmethod
+    def from_game_state(cls, game_state: InternalGameState) -> "Snapshot":
+        history = tuple(game_state.turn_history)
+        return cls(
+            username=game_state.username,
+            score=game_state.score,
+            rounds=len(history),
+            base_history=history,
+        )
+
+    def extend(self, *, turn: TurnOption, score: int) -> "Snapshot":
+        """Return a new snapshot one turn after this one."""
+        return Snapshot(
+            username=self.username,
+            score=score,
+            rounds=self.rounds + 1,
+            turn=turn,
+            parent=self,
+            base_history=self.base_history,
+        )
+
+    @property
+    def undoable_moves(self) -> int:
+        """Number of moves played since the start of the session."""
+        return self.rounds - len(self.base_history)
+
+    def rewind(self, moves: int = 1) -> "Snapshot":
+        """Step back up to `moves` turns, stopping at the start of the session."""
+        snapshot = self
+        for _ in range(min(moves, self.undoable_moves)):
+            snapshot = snapshot.parent  # type: ignore[assignment]
+        return snapshot
+
+    def turn_history(self) -> List[TurnOption]:
+        turns: List[TurnOption] = []
+        snapshot = self
+        while snapshot.parent is not None:
+            turns.append(snapshot.turn)  # type: ignore[arg-type]
+            snapshot = snapshot.parent
+        turns.reverse()
+        return list(self.base_history) + turns
+
+    def to_game_state(self) -> InternalGameState:
+        return InternalGameState(
+            username=self.username,
+            score=self.score,
+            turn_history=self.turn_history(),
+        )
+
+
+class GameTimeline:
+    """Tracks a session's snapshots, for undo and rewinding to checkpoints."""
+
+    def __init__(self, game_state: InternalGameState):
+        self.head = Snapshot.from_game_state(game_state)
+        self.checkpoints: List[Snapshot] = []
+
+    def record(self, game_state: InternalGameState) -> Snapshot:
+        """Bring the timeline up to date with a game state after a turn."""
+        rounds = len(game_state.turn_history)
+
+        if rounds == self.head.rounds + 1:
+            self.head = self.head.extend(
+                turn=game_state.turn_history[-1], score=game_state.score
+            )
+        elif rounds != self.head.rounds or game_state.score != self.head.score:
+            # The state changed outside of a single turn - start over from it
+            self.head = Snapshot.from_game_state(game_state)
+            self.checkpoints = []
+
+        return self.head
+
+    def checkpoint(self) -> Snapshot:
+        """Mark the current point of the session, so it can be returned to."""
+        self.checkpoints.append(self.head)
+        return self.head
+
+    def undo(self, moves: int = 1) -> InternalGameState:
+        """Undo the last `moves` turns, and return the restored game state."""
+        self.head = self.head.rewind(moves)
+        return self.head.to_game_state()
+
+    def rewind(
+        self, snapshot: Optional[Snapshot] = None
+    ) -> Optional[InternalGameState]:
+        """
+        Return to `snapshot`, or the most recent checkpoint.
+        Playing on from there branches off, and leaves the checkpoint intact.
+        """
+        snapshot = snapshot or (self.checkpoints[-1] if self.checkpoints else None)
+        if snapshot is None:
+            return None
+
+        self.head = snapshot
+        return snapshot.to_game_state()
@@ -0,0 +1,466 @@
+"""
+Streaming export and import of game states, as JSON Lines.
+
+Each user is written as any number of `turns` records, holding at most
+`chunk_turns` moves each, followed by one `state` record:
+
+    {"record":"turns","turns":["rock","paper",...]}
+    {"record":"state","username":"player1","score":3,"rounds":1234}
+
+Neither side ever holds a whole turn history in memory: state files are read
+with an incremental parser, and imported states are written out chunk by chunk.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from automata.core.rules import TURN_OPTIONS
+from automata.core.storage import get_state_file_path
+from automata.models import DisplayGameState
+
+CHUNK_TURNS = 1000
+READ_SIZE = 1 << 16
+VALIDATION_BATCH_LINES = 256
+
+_VALID_TURNS = frozenset(TURN_OPTIONS)
+
+# A run of plain strings each followed by a comma, like `"rock", "paper",`
+_STRING_RUN = re.compile(r'(?:\s*"[a-z]+"\s*,)+')
+_PLAIN_STRING = re.compile(r'"([a-z]+)"')
+
+# A turns record as written by `export_states`, capturing the items of its list
+_TURNS_LINE = re.compile(r'\{"record":"turns","turns":\[([^\]]*)\]\}\s*\Z')
+
+_SAFE_USERNAME = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+class TransferError(Exception):
+    """Raised when a state file or export stream can't be transferred."""
+
+
+class Progress:
+    """Counts what has been transferred, and reports throughput to stderr."""
+
+    def __init__(
+        self, verb: str, *, stream: Optional[IO[str]] = None, every: float = 0.5
+    ):
+        self.verb = verb
+        self.stream = stream
+        self.every = every
+        self.users = 0
+        self.turns = 0
+        self.started_at = time.perf_counter()
+        self._reported_at = self.started_at
+
+    def add(self, *, users: int = 0, turns: int = 0) -> None:
+        self.users += users
+        self.turns += turns
+        if time.perf_counter() - self._reported_at >= self.every:
+            self.report()
+
+    def report(self, *, final: bool = False) -> None:
+        if self.stream is None:
+            return
+
+        self._reported_at = time.perf_counter()
+        elapsed = max(self._reported_at - self.started_at, 1e-9)
+        print(
+            f"{self.verb} {self.users} users, {self.turns} turns in {elapsed:.2f}s "
+            f"({self.turns / elapsed:,.0f} turns/s)",
+            end="\n" if final else "\r",
+            file=self.stream,
+        )
+
+
+class _IncrementalReader:
+    """Reads JSON values out of a file, one at a time, buffering only what it must."""
+
+    def __init__(self, file: IO[str], read_size: int = READ_SIZE):
+        self.file = file
+        self.read_size = read_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> None:
+        chunk = self.file.read(self.read_size)
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" at the end of the file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos : self.pos + 1]
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise TransferError(f"Expected {char!r}, found {self.peek()!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise TransferError(f"Invalid JSON: {e}") from e
+                self._fill()
+                continue
+
+            # A number at the end of the buffer may carry on in the next read
+            if end == len(self.buffer) and not self.eof:
+                self._fill()
+                continue
+
+            self.pos = end
+            return value
+
+    def plain_strings(self) -> List[str]:
+        """Read a run of comma separated plain strings, in one go, if there is one."""
+        match = _STRING_RUN.match(self.buffer, self.pos)
+        if match is None:
+            return []
+
+        self.pos = match.end()
+        return _PLAIN_STRING.findall(match.group())
+
+
+def read_state_file(
+    state_file: str, *, chunk_turns: int = CHUNK_TURNS, read_size: int = READ_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """Stream a state file as export records - turn chunks, then the state."""
+    fields: Dict[str, Any] = {}
+    rounds = 0
+
+    with open(state_file) as file:
+        reader = _IncrementalReader(file, read_size)
+        reader.expect("{")
+
+        while reader.peek() != "}":
+            key = reader.value()
+            reader.expect(":")
+
+            if key != "turn_history":
+                fields[key] = reader.value()
+            else:
+                for turns in _read_turns(reader, chunk_turns):
+                    rounds += len(turns)
+                    yield {"record": "turns", "turns": turns}
+
+            if reader.peek() == ",":
+                reader.expect(",")
+
+        reader.expect("}")
+
+    try:
+        state = DisplayGameState.model_validate(fields)
+    except ValidationError as e:
+        raise TransferError(f"Invalid game state in {state_file}: {e}") from e
+
+    yield {
+        "record": "state",
+        "username": state.username,
+        "score": state.score,
+        "rounds": rounds,
+    }
+
+
+def _read_turns(reader: _IncrementalReader, chunk_turns: int) -> Iterator[List[str]]:
+    reader.expect("[")
+    turns: List[str] = []
+
+    while True:
+        # Most of a history is plain strings, which are much faster to read in bulk
+        turns += reader.plain_strings()
+        while len(turns) >= chunk_turns:
+            yield _checked_turns(turns[:chunk_turns])
+            turns = turns[chunk_turns:]
+
+        if reader.peek() == "]":
+            break
+        turns.append(reader.value())
+        if reader.peek() == ",":
+            reader.expect(",")
+
+    reader.expect("]")
+    if turns:
+        yield _checked_turns(turns)
+
+
+def _are_valid_turns(turns: List[Any]) -> bool:
+    try:
+        return _VALID_TURNS.issuperset(turns)
+    except TypeError:
+        # A nested list or object can't be hashed, so it can't be a turn either
+        return False
+
+
+def _checked_turns(turns: List[Any]) -> List[str]:
+    if not _are_valid_turns(turns):
+        invalid = next(
+            turn
+            for turn in turns
+            if not isinstance(turn, str) or turn not in _VALID_TURNS
+        )
+        raise TransferError(f"Invalid turn {invalid!r} in turn_history")
+    return turns
+
+
+def export_states(
+    state_files: Iterable[str],
+    output: IO[str],
+    *,
+    chunk_turns: int = CHUNK_TURNS,
+    progress: Optional[Progress] = None,
+) -> None:
+    """Write the given state files to `output`, as one JSON Lines stream."""
+    progress = progress or Progress("Exported")
+
+    for state_file in state_files:
+        for record in read_state_file(state_file, chunk_turns=chunk_turns):
+            output.write(json.dumps(record, separators=(",", ":")) + "\n")
+            if record["record"] == "turns":
+                progress.add(turns=len(record["turns"]))
+            else:
+                progress.add(users=1)
+
+    progress.report(final=True)
+
+
+def parse_line(line: str) -> Dict[str, Any]:
+    """
+    Parse and validate one export line. Turns records come back with their
+    turns as `items`, the JSON text inside the list, and their `count`; state
+    records with the values they validated to.
+    """
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise TransferError(f"Invalid JSON line: {e}") from e
+
+    kind = record.get("record") if isinstance(record, dict) else None
+    if kind == "turns":
+        turns = record.get("turns")
+        if not isinstance(turns, list) or not _are_valid_turns(turns):
+            raise TransferError("Invalid turns record")
+        # Turns are validated options, so they never need escaping
+        items = '"' + '","'.join(turns) + '"' if turns else ""
+        return {"record": "turns", "items": items, "count": len(turns)}
+
+    if kind == "state":
+        try:
+            state = DisplayGameState.model_validate(record)
+        except ValidationError as e:
+            raise TransferError(f"Invalid state record: {e}") from e
+        rounds = record.get("rounds")
+        if not isinstance(rounds, int) or isinstance(rounds, bool) or rounds < 0:
+            raise TransferError(f"Invalid rounds {rounds!r} in state record")
+        # Only the validated values are written, never the record's own JSON
+        return {
+            "record": "state",
+            "username": state.username,
+            "score": state.score,
+            "rounds": rounds,
+        }
+
+    raise TransferError(f"Unknown record type {kind!r}")
+
+
+def validate_lines(lines: List[str]) -> None:
+    """
+    Validate a batch of export lines, raising `TransferError` at the first
+    invalid one. Runs in worker processes, so nothing is sent back but the
+    result - the parent keeps the lines, and reads them without re-validating.
+    """
+    for line in lines:
+        parse_line(line)
+
+
+def _read_validated_line(line: str) -> Dict[str, Any]:
+    # Turns lines, as `export_states` writes them, don't need parsing at all
+    match = _TURNS_LINE.match(line)
+    if match is None:
+        return parse_line(line)
+
+    items = match.group(1).strip()
+    count = items.count(",") + 1 if items else 0
+    return {"record": "turns", "items": items, "count": count}
+
+
+def _batches(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for line in lines:
+        if line.strip():
+            batch.append(line)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _validated_records(
+    lines: Iterable[str], *, workers: int
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validate lines, in worker processes if `workers` > 1, and yield their
+    records in the original order.
+    """
+    batches = _batches(lines, VALIDATION_BATCH_LINES)
+
+    if workers <= 1:
+        for batch in batches:
+            for line in batch:
+                yield parse_line(line)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a few batches in flight per worker, so memory stays bounded
+        in_flight: Deque[Tuple[List[str], Future]] = deque()
+        for batch in batches:
+            in_flight.append((batch, pool.submit(validate_lines, batch)))
+            if len(in_flight) >= workers * 2:
+                yield from _read_validated_batch(*in_flight.popleft())
+        while in_flight:
+            yield from _read_validated_batch(*in_flight.popleft())
+
+
+def _read_validated_batch(batch: List[str], future: Future) -> Iterator[Dict[str, Any]]:
+    future.result()
+    for line in batch:
+        yield _read_validated_line(line)
+
+
+def get_user_file_name(username: Optional[str]) -> str:
+    """
+    A safe file name for a user's state, whatever their username is. Names
+    that had to be changed to be safe get a hash of the original, so that
+    different usernames never share a file.
+    """
+    if username is not None and _SAFE_USERNAME.fullmatch(username):
+        return username + ".json"
+
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", username or "Player")[:64]
+    digest = hashlib.sha1(json.dumps(username).encode()).hexdigest()[:8]
+    return f"{safe}-{digest}.json"
+
+
+class _StateWriter:
+    """Writes one user's state file, a chunk of turns at a time."""
+
+    def __init__(self, directory: str):
+        fd, self.path = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+        self.file = os.fdopen(fd, "w")
+        self.rounds = 0
+        self.file.write('{"turn_history":[')
+
+    def write_turns(self, items: str, count: int) -> None:
+        """Append `count` turns, given as the JSON text of the list items."""
+        if not count:
+            return
+        self.file.write(("," if self.rounds else "") + items)
+        self.rounds += count
+
+    def finish(self, record: Dict[str, Any]) -> str:
+        if record["rounds"] != self.rounds:
+            raise TransferError(
+                f"{record['username']} should have {record['rounds']} turns, "
+                f"found {self.rounds}"
+            )
+
+        username = json.dumps(record["username"])
+        score = json.dumps(record["score"])
+        self.file.write(f'],"username":{username},"score":{score}}}')
+        self.file.close()
+        return self.path
+
+    def discard(self) -> None:
+        self.file.close()
+        os.unlink(self.path)
+
+
+def import_states(
+    lines: Iterable[str],
+    *,
+    output_dir: Optional[str] = None,
+    workers: int = 1,
+    progress: Optional[Progress] = None,
+) -> List[str]:
+    """
+    Import an export stream, returning the state files written.
+
+    With `output_dir`, each user is written to `<output_dir>/<username>.json`.
+    Otherwise the stream must hold exactly one user, which is restored as the
+    current game state.
+    """
+    progress = progress or Progress("Imported")
+    directory = output_dir or os.path.dirname(get_state_file_path())
+    finished: List[Tuple[str, str]] = []
+    # Destinations written so far, by the name they'd have on a case-blind filesystem
+    written_to: Dict[str, Optional[str]] = {}
+    writer: Optional[_StateWriter] = None
+
+    try:
+        for record in _validated_records(lines, workers=workers):
+            if writer is None:
+                writer = _StateWriter(directory)
+
+            if record["record"] == "turns":
+                writer.write_turns(record["items"], record["count"])
+                progress.add(turns=record["count"])
+                continue
+
+            if output_dir is None and finished:
+                raise TransferError(
+                    "The export holds more than one user - import it to a directory"
+                )
+
+            destination = (
+                os.path.join(output_dir, get_user_file_name(record["username"]))
+                if output_dir
+                else get_state_file_path()
+            )
+            key = os.path.normcase(destination).casefold()
+            if key in written_to:
+                raise TransferError(
+                    f"Users {written_to[key]!r} and {record['username']!r} "
+                    f"would both be written to {destination}"
+                )
+            written_to[key] = record["username"]
+
+            finished.append((writer.finish(record), destination))
+            writer = None
+            progress.add(users=1)
+
+        if writer is not None:
+            raise TransferError("The export ends part way through a user")
+    except BaseException:
+        if writer is not None:
+            writer.discard()
+        for temp_path, _ in finished:
+            os.unlink(temp_path)
+        raise
+
+    # Only replace existing state files once the whole stream is valid
+    for temp_path, destination in finished:
+        os.replace(temp_path, destination)
+
+    progress.report(final=True)
+    return [destination for _, destination in finished]
@@ -18,7 +18,8 @@ def setup_logging(log_file=None, log_level=logging.ERROR):
     stream_handler = logging.StreamHandler()
     stream_handler.setLevel(log_level)
 
-    file_handler = logging.FileHandler(log_file or get_log_file_path())
+    # Only create the log file once something is actually logged
+    file_handler = logging.FileHandler(log_file or get_log_file_path(), delay=True)
     file_handler.setLevel(logging.DEBUG)
 
     logging.basicConfig(
@@ -20,3 +20,18 @@ class TurnResult(BaseModel):
     computer_choice: Optional[TurnOption]
     outcome: TurnOutcome
     reason: str
+
+
+class ReplaySummary(BaseModel):
+    opponent: str
+    rounds: int
+    seeds: int
+    actual_score: int
+    mean: float
+    stdev: float
+    minimum: int
+    p5: int
+    median: int
+    p95: int
+    maximum: int
+    better_than_actual: float
@@ -0,0 +1,449 @@
+"""
+End-to-end load test for the interactive CLI.
+
+Spawns `python -m automata` under a pseudo-terminal, drives it with a scripted
+sequence of keystrokes and measures how long each frame takes to appear. Inside
+the CLI process, the functions that draw a frame are timed too, so the report
+shows where the time within a frame goes.
+
+Timing those functions means running the CLI from this module, which imports
+and patches them before the game starts. Startup is measured separately, on a
+plain `python -m automata --no-daemon`.
+
+    python -m automata.perf.cli_load_test --rounds 2000
+"""
+
+import argparse
+import functools
+import importlib
+import os
+import pty
+import random
+import select
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Literal, Optional, Tuple, TypeAlias
+
+from automata.perf.profiling import replace_everywhere
+
+StepKind: TypeAlias = Literal["move", "invalid", "restart", "log_out", "quit"]
+
+CHOICE_PROMPT = b"Enter your choice"
+USERNAME_PROMPT = b"Enter your username"
+RESULT_PROMPT = b"Press Enter to continue..."
+GOODBYE = b"Goodbye"
+
+# Functions timed inside the CLI process, by the component they're reported as.
+# Timings are inclusive: `width` is part of `title`, and `save` is part of `turn`.
+# `odds` is worked out with the scoreboard, before `score` prints it
+TIMED_COMPONENTS: Dict[str, Tuple[str, str]] = {
+    "clear": ("automata.ui.screen", "clear_screen"),
+    "title": ("automata.ui.screen", "print_title"),
+    "width": ("automata.ui.screen", "get_screen_width"),
+    "score": ("automata.ui.screen", "print_scoreboard"),
+    "odds": ("automata.core.session", "get_odds"),
+    "options": ("automata.ui.screen", "print_options"),
+    "turn": ("automata.core.game", "play_turn"),
+    "save": ("automata.core.storage", "save_game_state"),
+}
+
+
+class HarnessError(Exception):
+    """Raised when the CLI under test does not behave as scripted."""
+
+
+@dataclass
+class Step:
+    kind: StepKind
+    keys: str
+
+
+@dataclass
+class FrameTiming:
+    """Time spent in one phase of a step, from keystroke to the next marker."""
+
+    step: StepKind
+    phase: str
+    seconds: float
+    output_bytes: int
+
+
+@dataclass
+class SessionReport:
+    # From spawning a plain CLI to its first menu
+    startup_seconds: float = 0.0
+    # The same, for the instrumented CLI the session is played against
+    harness_startup_seconds: float = 0.0
+    total_seconds: float = 0.0
+    frames: List[FrameTiming] = field(default_factory=list)
+    # Seconds spent in each call of a timed component, inside the CLI process
+    components: Dict[str, List[float]] = field(default_factory=dict)
+
+    @property
+    def rounds(self) -> int:
+        return sum(1 for frame in self.frames if frame.phase == "turn")
+
+
+def build_script(
+    *,
+    rounds: int,
+    seed: Optional[int] = None,
+    invalid_rate: float = 0.05,
+    restart_rate: float = 0.01,
+    log_out_rate: float = 0.005,
+) -> List[Step]:
+    """Build a reproducible keystroke script of `rounds` moves plus noise."""
+    rng = random.Random(seed)
+    steps: List[Step] = []
+
+    for _ in range(rounds):
+        roll = rng.random()
+        if roll < invalid_rate:
+            steps.append(Step("invalid", rng.choice(["x", "9", "0", "rock", ""])))
+        elif roll < invalid_rate + restart_rate:
+            steps.append(Step("restart", "r"))
+        elif roll < invalid_rate + restart_rate + log_out_rate:
+            steps.append(Step("log_out", "l"))
+
+        steps.append(Step("move", str(rng.randint(1, 5))))
+
+    steps.append(Step("quit", "q"))
+    return steps
+
+
+def summarize(report: SessionReport) -> Dict[str, Dict[str, float]]:
+    """Aggregate frame timings by `step/phase`, with latencies in milliseconds."""
+    grouped: Dict[str, List[FrameTiming]] = {}
+    for frame in report.frames:
+        grouped.setdefault(f"{frame.step}/{frame.phase}", []).append(frame)
+
+    summary: Dict[str, Dict[str, float]] = {}
+    for key, frames in sorted(grouped.items()):
+        latencies = sorted(frame.seconds * 1000 for frame in frames)
+        summary[key] = {
+            "count": len(latencies),
+            "total_ms": sum(latencies),
+            "mean_ms": statistics.fmean(latencies),
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "p99_ms": _percentile(latencies, 99),
+            "max_ms": latencies[-1],
+            "mean_bytes": statistics.fmean(frame.output_bytes for frame in frames),
+        }
+
+    return summary
+
+
+def summarize_components(report: SessionReport) -> Dict[str, Dict[str, float]]:
+    """Aggregate the time spent in each timed component, in milliseconds."""
+    summary: Dict[str, Dict[str, float]] = {}
+    for component in TIMED_COMPONENTS:
+        latencies = sorted(
+            seconds * 1000 for seconds in report.components.get(component, [])
+        )
+        if not latencies:
+            continue
+
+        summary[component] = {
+            "count": len(latencies),
+            "total_ms": sum(latencies),
+            "mean_ms": statistics.fmean(latencies),
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "max_ms": latencies[-1],
+        }
+
+    return summary
+
+
+def format_report(report: SessionReport) -> str:
+    """Render a session report as plain-text tables."""
+    summary = summarize(report)
+    frame_total = sum(stats["total_ms"] for stats in summary.values()) or 1.0
+
+    lines = [
+        f"Startup:       {report.startup_seconds * 1000:10.1f} ms",
+        f"  (harness:    {report.harness_startup_seconds * 1000:10.1f} ms)",
+        f"Session total: {report.total_seconds * 1000:10.1f} ms",
+        f"Rounds played: {report.rounds:10d}",
+        f"Rounds/sec:    {report.rounds / (report.total_seconds or 1.0):10.1f}",
+        "",
+        f"{'frame':<18}{'count':>7}{'mean':>9}{'p50':>9}{'p95':>9}"
+        f"{'p99':>9}{'max':>9}{'bytes':>8}{'share':>8}",
+    ]
+    for key, stats in summary.items():
+        lines.append(
+            f"{key:<18}{stats['count']:>7.0f}{stats['mean_ms']:>9.2f}"
+            f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+            f"{stats['max_ms']:>9.2f}{stats['mean_bytes']:>8.0f}"
+            f"{stats['total_ms'] / frame_total:>8.1%}"
+        )
+
+    components = summarize_components(report)
+    if components:
+        session_total = report.total_seconds * 1000 or 1.0
+        lines += [
+            "",
+            "Inside the CLI (inclusive: width is part of title, save of turn)",
+            f"{'component':<18}{'count':>7}{'mean':>9}{'p50':>9}{'p95':>9}"
+            f"{'max':>9}{'total':>10}{'share':>8}",
+        ]
+        for component, stats in components.items():
+            lines.append(
+                f"{component:<18}{stats['count']:>7.0f}{stats['mean_ms']:>9.3f}"
+                f"{stats['p50_ms']:>9.3f}{stats['p95_ms']:>9.3f}"
+                f"{stats['max_ms']:>9.3f}{stats['total_ms']:>10.1f}"
+                f"{stats['total_ms'] / session_total:>8.1%}"
+            )
+
+    return "\n".join(lines)
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    index = round((len(sorted_values) - 1) * percent / 100)
+    return sorted_values[index]
+
+
+class PtySession:
+    """
+    A `python -m automata` process attached to a pseudo-terminal. With
+    `timings_path`, it runs with its components timed, writing their timings
+    there when it exits.
+    """
+
+    def __init__(
+        self,
+        *,
+        state_dir: str,
+        timings_path: Optional[str] = None,
+        timeout: float = 10.0,
+    ):
+        self.timeout = timeout
+        self.buffer = b""
+
+        # Run the checkout this harness lives in, with its own state and logs
+        package_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        python_path = os.pathsep.join(
+            filter(None, [package_root, os.environ.get("PYTHONPATH")])
+        )
+        env = dict(
+            os.environ,
+            PYTHONPATH=python_path,
+            TMPDIR=state_dir,
+            TERM=os.environ.get("TERM", "xterm"),
+        )
+        command = (
+            ["automata.perf.cli_load_test", "--child-timings", timings_path]
+            if timings_path
+            else ["automata", "--no-daemon"]
+        )
+        self.master_fd, slave_fd = pty.openpty()
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", *command],
+            stdin=slave_fd,
+            stdout=slave_fd,
+            stderr=slave_fd,
+            env=env,
+            close_fds=True,
+        )
+        os.close(slave_fd)
+
+    def send(self, keys: str) -> None:
+        os.write(self.master_fd, keys.encode() + b"\r")
+
+    def wait_for(self, marker: bytes) -> int:
+        """
+        Block until `marker` is printed; return the number of bytes printed up
+        to and including it, counting any that were already buffered.
+        """
+        deadline = time.perf_counter() + self.timeout
+
+        while True:
+            index = self.buffer.find(marker)
+            if index != -1:
+                consumed = index + len(marker)
+                self.buffer = self.buffer[consumed:]
+                return consumed
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise HarnessError(f"Timed out waiting for {marker!r}")
+
+            readable, _, _ = select.select([self.master_fd], [], [], remaining)
+            if not readable:
+                continue
+
+            try:
+                chunk = os.read(self.master_fd, 65536)
+            except OSError:
+                chunk = b""
+            if not chunk:
+                raise HarnessError(f"CLI exited while waiting for {marker!r}")
+
+            self.buffer += chunk
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        os.close(self.master_fd)
+
+
+def _start(session: PtySession, username: str) -> None:
+    session.wait_for(USERNAME_PROMPT)
+    session.send(username)
+    session.wait_for(CHOICE_PROMPT)
+
+
+def measure_startup(*, username: str = "loadtest", timeout: float = 10.0) -> float:
+    """Seconds from spawning a plain CLI, on a new game, to its first menu."""
+    with tempfile.TemporaryDirectory(prefix="automata-loadtest-") as state_dir:
+        start = time.perf_counter()
+        session = PtySession(state_dir=state_dir, timeout=timeout)
+        try:
+            _start(session, username)
+            startup = time.perf_counter() - start
+            session.send("q")
+            session.process.wait(timeout=timeout)
+        finally:
+            session.close()
+
+    return startup
+
+
+def run_session(
+    steps: List[Step], *, username: str = "loadtest", timeout: float = 10.0
+) -> SessionReport:
+    """Play `steps` against a fresh CLI process and time every frame."""
+    report = SessionReport(
+        startup_seconds=measure_startup(username=username, timeout=timeout)
+    )
+
+    with tempfile.TemporaryDirectory(prefix="automata-loadtest-") as state_dir:
+        timings_path = os.path.join(state_dir, "frame-timings.txt")
+        session_start = time.perf_counter()
+        session = PtySession(
+            state_dir=state_dir, timings_path=timings_path, timeout=timeout
+        )
+        try:
+            _start(session, username)
+            report.harness_startup_seconds = time.perf_counter() - session_start
+
+            for step in steps:
+                _play_step(session, step, report, username=username)
+
+            session.process.wait(timeout=timeout)
+        finally:
+            session.close()
+
+        report.total_seconds = time.perf_counter() - session_start
+        report.components = read_component_timings(timings_path)
+
+    return report
+
+
+def read_component_timings(timings_path: str) -> Dict[str, List[float]]:
+    components: Dict[str, List[float]] = {}
+    if not os.path.exists(timings_path):
+        return components
+
+    with open(timings_path) as file:
+        for line in file:
+            component, seconds = line.split()
+            components.setdefault(component, []).append(float(seconds))
+
+    return components
+
+
+def run_timed_cli(timings_path: str) -> None:
+    """
+    Run the CLI with each of `TIMED_COMPONENTS` wrapped in a timer, and write
+    every call's duration to `timings_path` when it exits.
+    """
+    timings: List[Tuple[str, float]] = []
+
+    def timed(component: str, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.append((component, time.perf_counter() - start))
+
+        return wrapper
+
+    for component, (module_name, attribute) in TIMED_COMPONENTS.items():
+        original = getattr(importlib.import_module(module_name), attribute)
+        replace_everywhere(original, timed(component, original))
+
+    from automata.__main__ import main
+
+    try:
+        main(["--no-daemon"])
+    finally:
+        with open(timings_path, "w") as file:
+            file.writelines(f"{name} {seconds!r}\n" for name, seconds in timings)
+
+
+def _play_step(
+    session: PtySession, step: Step, report: SessionReport, *, username: str
+) -> None:
+    def timed(phase: str, keys: str, marker: bytes) -> None:
+        start = time.perf_counter()
+        session.send(keys)
+        received = session.wait_for(marker)
+        report.frames.append(
+            FrameTiming(step.kind, phase, time.perf_counter() - start, received)
+        )
+
+    if step.kind == "move":
+        # keystroke -> result screen: play_turn, computer choice, save
+        timed("turn", step.keys, RESULT_PROMPT)
+        # enter -> next menu: clear screen, title, score and options
+        timed("redraw", "", CHOICE_PROMPT)
+    elif step.kind in ("invalid", "restart"):
+        timed("redraw", step.keys, CHOICE_PROMPT)
+    elif step.kind == "log_out":
+        timed("prompt", step.keys, USERNAME_PROMPT)
+        timed("redraw", username, CHOICE_PROMPT)
+    elif step.kind == "quit":
+        timed("exit", step.keys, GOODBYE)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m automata.perf.cli_load_test",
+        description="Drive the CLI through a pseudo-terminal and time each frame.",
+    )
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--invalid-rate", type=float, default=0.05)
+    parser.add_argument("--restart-rate", type=float, default=0.01)
+    parser.add_argument("--log-out-rate", type=float, default=0.005)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    # Used by the harness to run the CLI under test
+    parser.add_argument("--child-timings", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child_timings:
+        run_timed_cli(args.child_timings)
+        return
+
+    steps = build_script(
+        rounds=args.rounds,
+        seed=args.seed,
+        invalid_rate=args.invalid_rate,
+        restart_rate=args.restart_rate,
+        log_out_rate=args.log_out_rate,
+    )
+    report = run_session(steps, timeout=args.timeout)
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
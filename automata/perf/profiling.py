@@ -0,0 +1,220 @@
+"""
+Profiling for any `python -m automata` command.
+
+    python -m automata --profile /tmp/session --profile-memory
+
+writes:
+- `/tmp/session.pstats` - deterministic profile, for `pstats` / snakeviz
+- `/tmp/session.folded` - sampled stacks, for flamegraph.pl / speedscope
+- `/tmp/session.memory.txt` - allocations per call of the probed functions
+
+Nothing outside this module knows about profiling: the probed functions are
+wrapped for the length of the session, and restored afterwards.
+"""
+
+import cProfile
+import functools
+import importlib
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Functions measured by a memory profile, as (module, attribute)
+MEMORY_PROBES: Tuple[Tuple[str, str], ...] = (
+    ("automata.core.game", "play_turn"),
+    ("automata.core.storage", "save_game_state"),
+)
+
+
+class StackSampler:
+    """Periodically samples the stack of one thread, and counts folded stacks."""
+
+    def __init__(self, *, interval: float = 0.001, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[fold_stack(frame)] += 1
+
+    def write_folded(self, file_path: str) -> None:
+        with open(file_path, "w") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def fold_stack(frame: Optional[FrameType]) -> str:
+    """Render a stack as `root;...;leaf`, the input format of flamegraph tools."""
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        file_name = os.path.basename(code.co_filename)
+        names.append(f"{code.co_name} ({file_name}:{code.co_firstlineno})")
+        frame = frame.f_back
+
+    names.reverse()
+    return ";".join(name.replace(";", ":") for name in names)
+
+
+@dataclass
+class CallAllocation:
+    name: str
+    net_bytes: int
+    peak_bytes: int
+    traced_bytes: int
+
+
+@dataclass
+class AllocationTracker:
+    """Records the memory allocated by each call to a probed function."""
+
+    calls: List[CallAllocation] = field(default_factory=list)
+    # For each probed call in progress, the highest peak seen before its last reset
+    _peaks: List[int] = field(default_factory=list)
+
+    def measure(self, name: str, func: Callable, *args, **kwargs):
+        before, peak = tracemalloc.get_traced_memory()
+        # Every call resets the peak, so a nested call only sees its own. The
+        # caller's peak so far is kept aside, to be combined when it finishes
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        self._peaks.append(0)
+        tracemalloc.reset_peak()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            after, peak = tracemalloc.get_traced_memory()
+            peak = max(self._peaks.pop(), peak)
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            self.calls.append(
+                CallAllocation(
+                    name=name,
+                    net_bytes=after - before,
+                    peak_bytes=peak - before,
+                    traced_bytes=after,
+                )
+            )
+
+    def probe(self, name: str, func: Callable) -> Callable:
+        """Wrap `func`, so that each call to it is measured."""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.measure(name, func, *args, **kwargs)
+
+        return wrapper
+
+    def report(self, start: tracemalloc.Snapshot, end: tracemalloc.Snapshot) -> str:
+        lines = [
+            f"{'call':>6}  {'function':<20}{'net':>10}{'peak':>10}{'traced':>12}",
+        ]
+        counts: Dict[str, int] = {}
+        for call in self.calls:
+            counts[call.name] = counts.get(call.name, 0) + 1
+            lines.append(
+                f"{counts[call.name]:>6}  {call.name:<20}{call.net_bytes:>10}"
+                f"{call.peak_bytes:>10}{call.traced_bytes:>12}"
+            )
+
+        lines += ["", "Top allocation growth over the session:"]
+        for stat in end.compare_to(start, "lineno")[:20]:
+            lines.append(str(stat))
+
+        return "\n".join(lines) + "\n"
+
+
+def replace_everywhere(original: Callable, replacement: Callable) -> None:
+    """
+    Replace `original` with `replacement` in every loaded module - functions are
+    usually imported by name, so patching the module that defines one isn't enough.
+    """
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None) or {}
+        for attribute, value in list(namespace.items()):
+            if value is original:
+                setattr(module, attribute, replacement)
+
+
+@contextmanager
+def _probed(
+    tracker: AllocationTracker, probes: Sequence[Tuple[str, str]]
+) -> Iterator[None]:
+    """Have `tracker` measure every call to `probes`, until the block exits."""
+    wrapped: List[Tuple[Callable, Callable]] = []
+    for module_name, attribute in probes:
+        original = getattr(importlib.import_module(module_name), attribute)
+        wrapper = tracker.probe(attribute, original)
+        replace_everywhere(original, wrapper)
+        wrapped.append((original, wrapper))
+
+    try:
+        yield
+    finally:
+        for original, wrapper in wrapped:
+            replace_everywhere(wrapper, original)
+
+
+@contextmanager
+def profile_session(
+    prefix: str,
+    *,
+    memory: bool = False,
+    sample_interval: float = 0.001,
+    probes: Sequence[Tuple[str, str]] = MEMORY_PROBES,
+) -> Iterator[None]:
+    """
+    Profile everything run inside the block, writing results next to `prefix`.
+    With `memory`, also measure the allocations of every call to `probes`.
+    """
+    sampler = StackSampler(interval=sample_interval)
+    profiler = cProfile.Profile()
+
+    tracker = AllocationTracker()
+    probing = _probed(tracker, probes) if memory else nullcontext()
+    if memory:
+        tracemalloc.start()
+        start_snapshot = tracemalloc.take_snapshot()
+
+    started_at = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        with probing:
+            yield
+    finally:
+        profiler.disable()
+        sampler.stop()
+        elapsed = time.perf_counter() - started_at
+
+        profiler.dump_stats(f"{prefix}.pstats")
+        sampler.write_folded(f"{prefix}.folded")
+        written = [f"{prefix}.pstats", f"{prefix}.folded"]
+
+        if memory:
+            end_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            with open(f"{prefix}.memory.txt", "w") as file:
+                file.write(tracker.report(start_snapshot, end_snapshot))
+            written.append(f"{prefix}.memory.txt")
+
+        print(f"\nProfiled {elapsed:.2f}s, wrote {', '.join(written)}", file=sys.stderr)
@@ -0,0 +1,180 @@
+"""
+The game's terminal screen, and the loop that plays it. The game itself is
+anything with the `Game` interface - a `GameSession` in this process, or a
+`DaemonClient`.
+"""
+
+import os
+import shutil
+import sys
+from typing import (
+    TYPE_CHECKING,
+    List,
+    Literal,
+    Optional,
+    Protocol,
+    TypeAlias,
+    Union,
+    cast,
+)
+
+from automata.core.scoreboard import Scoreboard
+
+if TYPE_CHECKING:
+    from automata.models import TurnOption
+
+VALID_OPTIONS: List["TurnOption"] = ["rock", "paper", "scissors", "lizard", "spock"]
+
+GameAction: TypeAlias = Literal["restart", "log_out", "undo", "checkpoint", "rewind"]
+
+
+class Game(Protocol):
+    def scoreboard(self) -> Scoreboard: ...
+
+    def play(self, move: "TurnOption") -> str: ...
+
+    def undo(self) -> str: ...
+
+    def checkpoint(self) -> str: ...
+
+    def rewind(self) -> str: ...
+
+    def restart(self) -> None: ...
+
+    def log_in(self, username: Optional[str]) -> None: ...
+
+    def set_username(self, username: str) -> None: ...
+
+
+def clear_screen() -> None:
+    """Clear the terminal screen."""
+    os.system("cls" if os.name == "nt" else "clear")
+
+
+def get_screen_width() -> int:
+    cols, _ = shutil.get_terminal_size()
+    return min(cols, 75)
+
+
+def print_title() -> None:
+    """Print the game title."""
+    width = get_screen_width()
+    print("\n" + "=" * width)
+    print(f"{'ROCK, PAPER, SCISSORS, LIZARD, SPOCK':^{width}}")
+    print("=" * width + "\n")
+
+
+def print_options() -> None:
+    """Print the available options."""
+    print("\nChoose your move:")
+    for i, option in enumerate(VALID_OPTIONS, 1):
+        print(f"{i}. {option.capitalize()}")
+
+    print("\nGame Options")
+    print("U. Undo last move")
+    print("C. Save checkpoint")
+    print("B. Back to last checkpoint")
+    print("R. Restart Game")
+    print("L. Log out of Game")
+    print("Q. Quit Game")
+
+
+def print_scoreboard(*, scoreboard: Scoreboard) -> None:
+    """Print the current score, and the player's odds if there are any."""
+    username = scoreboard.username or "Player"
+    print(f"Hello {username},")
+    print(f"\nScore: {scoreboard.score}")
+    print(f"Rounds played: {scoreboard.rounds}")
+
+    odds = scoreboard.odds
+    if odds is not None:
+        print(f"Chance you're ahead after {odds.rounds} more rounds: {odds.ahead:.1%}")
+        print(f"Chance you win a best of {odds.best_of}: {odds.win_best_of:.1%}")
+
+
+def get_player_choice() -> Optional[Union["TurnOption", GameAction]]:
+    """Get the player's choice from input."""
+    while True:
+        choice = input("\nEnter your choice (1-5, U, C, B, R, L, Q): ").strip().lower()
+
+        if choice == "q":
+            print("\nThanks for playing! Goodbye.")
+            sys.exit(0)
+
+        if choice == "l":
+            return "log_out"
+
+        if choice == "r":
+            return "restart"
+
+        if choice == "u":
+            return "undo"
+
+        if choice == "c":
+            return "checkpoint"
+
+        if choice == "b":
+            return "rewind"
+
+        if choice.isdigit() and 1 <= int(choice) <= 5:
+            return VALID_OPTIONS[int(choice) - 1]
+
+        clear_screen()
+        print("Invalid choice. Please try again.")
+        print_options()
+
+
+def ask_for_username(current_username: Optional[str]) -> str:
+    """Ask the user for a username."""
+    default = current_username or "Player"
+    username = input(f"\nEnter your username [{default}]: ").strip()
+    return username if username else default
+
+
+def display_result(*, result_text: str) -> None:
+    """Display the result of the turn with some visual emphasis."""
+    print("\n" + "-" * get_screen_width())
+    print(result_text)
+    print("-" * get_screen_width())
+    input("\nPress Enter to continue...")
+
+
+def play_game(game: Game) -> None:
+    """Run the main game loop, until the player quits."""
+    # If this is a new game, ask for username
+    if game.scoreboard().username is None:
+        game.set_username(ask_for_username(None))
+
+    while True:
+        clear_screen()
+        print_title()
+        print_scoreboard(scoreboard=game.scoreboard())
+        print_options()
+
+        player_choice = get_player_choice()
+
+        # Restart the game if requested
+        if player_choice == "restart":
+            game.restart()
+            continue
+
+        # Log out of the game if requested
+        if player_choice == "log_out":
+            game.log_in(ask_for_username(None))
+            continue
+
+        if player_choice == "undo":
+            display_result(result_text=game.undo())
+            continue
+
+        if player_choice == "checkpoint":
+            display_result(result_text=game.checkpoint())
+            continue
+
+        if player_choice == "rewind":
+            display_result(result_text=game.rewind())
+            continue
+
+        player_choice = cast("TurnOption", player_choice)
+        # Play the turn, and display the result
+        display_result(result_text=game.play(player_choice))
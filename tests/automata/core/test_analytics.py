@@ -0,0 +1,124 @@
+from itertools import product
+
+import pytest
+
+from automata.core import analytics
+from automata.core.analytics import (
+    UNIFORM_DISTRIBUTION,
+    RoundProbabilities,
+    get_best_of_probability,
+    get_count_distribution,
+    get_move_distribution,
+    get_probability_ahead,
+    get_round_probabilities,
+    get_score_distribution,
+)
+
+ROCK = (1.0, 0.0, 0.0, 0.0, 0.0)
+SCISSORS = (0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def brute_force_distribution(probabilities, rounds):
+    """Enumerate every sequence of outcomes."""
+    outcomes = {1: probabilities.win, -1: probabilities.lose, 0: probabilities.tie}
+    distribution = {}
+    for sequence in product(outcomes, repeat=rounds):
+        chance = 1.0
+        for outcome in sequence:
+            chance *= outcomes[outcome]
+        distribution[sum(sequence)] = distribution.get(sum(sequence), 0) + chance
+    return distribution
+
+
+def test_get_move_distribution():
+    assert get_move_distribution([]) == UNIFORM_DISTRIBUTION
+    assert get_move_distribution(["rock", "rock", "spock", "paper"]) == (
+        0.5,
+        0.25,
+        0.0,
+        0.0,
+        0.25,
+    )
+
+
+def test_get_count_distribution():
+    assert get_count_distribution({}) == UNIFORM_DISTRIBUTION
+    assert get_count_distribution({"spock": 3, "rock": 1}) == (
+        0.25,
+        0.0,
+        0.0,
+        0.0,
+        0.75,
+    )
+
+
+def test_round_probabilities_against_random_computer():
+    probabilities = get_round_probabilities(ROCK)
+
+    assert probabilities.win == pytest.approx(0.4)
+    assert probabilities.lose == pytest.approx(0.4)
+    assert probabilities.tie == pytest.approx(0.2)
+
+
+def test_round_probabilities_follow_game_rules():
+    assert get_round_probabilities(ROCK, SCISSORS) == RoundProbabilities(1, 0, 0)
+    assert get_round_probabilities(SCISSORS, ROCK) == RoundProbabilities(0, 1, 0)
+    assert get_round_probabilities(ROCK, ROCK) == RoundProbabilities(0, 0, 1)
+
+
+@pytest.mark.parametrize("rounds", [0, 1, 2, 5])
+def test_score_distribution_matches_enumeration(rounds):
+    probabilities = RoundProbabilities(win=0.5, lose=0.3, tie=0.2)
+
+    distribution = get_score_distribution(probabilities, rounds)
+    expected = brute_force_distribution(probabilities, rounds)
+
+    assert distribution.keys() == expected.keys()
+    for change, chance in expected.items():
+        assert distribution[change] == pytest.approx(chance)
+
+
+def test_score_distribution_over_many_rounds():
+    probabilities = RoundProbabilities(win=0.5, lose=0.3, tie=0.2)
+
+    distribution = get_score_distribution(probabilities, 200)
+
+    assert sum(distribution.values()) == pytest.approx(1)
+    mean = sum(change * chance for change, chance in distribution.items())
+    assert mean == pytest.approx(200 * (0.5 - 0.3))
+
+
+def test_probability_ahead():
+    even = RoundProbabilities(win=0.4, lose=0.4, tie=0.2)
+
+    # ahead means strictly above zero, so a tie after one round isn't
+    assert get_probability_ahead(even, rounds=1) == pytest.approx(0.4)
+    assert get_probability_ahead(even, rounds=1, score=1) == pytest.approx(0.6)
+    assert get_probability_ahead(even, rounds=3, score=5) == pytest.approx(1)
+    assert get_probability_ahead(even, rounds=0, score=-1) == 0
+
+
+def test_best_of_probability():
+    even = RoundProbabilities(win=0.4, lose=0.4, tie=0.2)
+    favoured = RoundProbabilities(win=0.6, lose=0.2, tie=0.2)
+
+    assert get_best_of_probability(even, 5) == pytest.approx(0.5)
+    assert get_best_of_probability(favoured, 1) == pytest.approx(0.75)
+    # first to two: win-win, or one loss in the first two rounds then a win
+    assert get_best_of_probability(favoured, 3) == pytest.approx(
+        0.75**2 + 2 * 0.75**2 * 0.25
+    )
+    assert get_best_of_probability(RoundProbabilities(0, 0, 1), 3) == 0
+
+
+def test_results_are_cached_per_distribution_and_rounds():
+    analytics._score_distribution.cache_clear()
+    probabilities = get_round_probabilities(get_move_distribution(["rock", "paper"]))
+
+    get_probability_ahead(probabilities, rounds=10)
+    get_score_distribution(probabilities, 10)
+    get_probability_ahead(probabilities, rounds=20)
+
+    info = analytics._score_distribution.cache_info()
+    assert info.hits == 1
+    assert info.misses == 2
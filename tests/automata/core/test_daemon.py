@@ -0,0 +1,228 @@
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+
+import pytest
+
+from automata.__main__ import main
+from automata.core import storage
+from automata.core.daemon import StateDaemon, remove_stale_socket
+from automata.core.daemon_client import DaemonClient, DaemonError
+from automata.core.scoreboard import Scoreboard
+from automata.models import InternalGameState
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths have a short length limit, so avoid pytest's tmp_path
+    with tempfile.TemporaryDirectory(prefix="automata-") as directory:
+        yield os.path.join(directory, "daemon.sock")
+
+
+@pytest.fixture
+def mock_storage(monkeypatch):
+    class MockStorage:
+        def __init__(self):
+            self.state = InternalGameState(username="player1", score=2)
+            self.saved = []
+
+        def load_game_state(self):
+            return self.state
+
+        def save_game_state(self, *, game_state):
+            self.saved.append(game_state)
+
+    mock = MockStorage()
+    monkeypatch.setattr(storage, "load_game_state", mock.load_game_state)
+    monkeypatch.setattr(storage, "save_game_state", mock.save_game_state)
+    return mock
+
+
+@pytest.fixture
+def daemon(socket_path, mock_storage):
+    server = StateDaemon(socket_path)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def client(daemon, socket_path):
+    client = DaemonClient.connect(socket_path)
+    yield client
+    client.close()
+
+
+def test_connect_without_daemon(socket_path):
+    assert DaemonClient.connect(socket_path) is None
+
+
+def test_client_starts_with_daemons_scoreboard(client):
+    scoreboard = client.start()
+
+    assert scoreboard.username == "player1"
+    assert scoreboard.score == 2
+    assert scoreboard.rounds == 0
+    assert scoreboard.odds is None
+
+
+def test_daemon_plays_moves(client, daemon):
+    client.start()
+
+    result = client.play("rock")
+
+    assert "Your choice: rock" in result
+    assert "Computer's choice: " in result
+    assert client.scoreboard().rounds == 1
+    assert client.scoreboard().score == daemon.session.game_state.score
+    assert daemon.session.game_state.turn_history == ["rock"]
+
+
+def test_daemon_undoes_moves_of_the_session(client):
+    client.start()
+
+    assert client.undo() == "Nothing to undo. What's done is done."
+    client.play("paper")
+    assert client.undo() == "Fine. Let's pretend that never happened."
+    assert client.scoreboard().rounds == 0
+    assert client.scoreboard().score == 2
+
+
+def test_daemon_rewinds_to_checkpoint(client):
+    client.start()
+
+    assert client.rewind() == "No checkpoint to go back to."
+    assert client.checkpoint().startswith("Checkpoint saved at round 0.")
+    client.play("spock")
+    client.play("lizard")
+    assert client.rewind() == "Back to round 0. Try again."
+    assert client.scoreboard().rounds == 0
+
+
+def test_daemon_restarts_and_logs_in(client):
+    client.start()
+    client.play("rock")
+
+    client.restart()
+    assert client.scoreboard() == Scoreboard(username="player1", score=0, rounds=0)
+
+    client.log_in("player 2")
+    assert client.scoreboard().username == "player 2"
+
+    client.set_username('a "quoted" name')
+    assert client.scoreboard().username == 'a "quoted" name'
+
+
+def test_daemon_rejects_bad_requests(client):
+    with pytest.raises(DaemonError):
+        client.request("play", "dynamite")
+    with pytest.raises(DaemonError):
+        client.request("log_in", "not json")
+    with pytest.raises(DaemonError):
+        client.request("explode")
+    assert client.request("ping") is None
+
+
+def test_daemon_flush_only_writes_changes(daemon, mock_storage):
+    daemon.flush()
+    assert mock_storage.saved == []
+
+    daemon.handle_line('set_username "player2"')
+    daemon.flush()
+    daemon.flush()
+    assert mock_storage.saved[-1].username == "player2"
+    assert len(mock_storage.saved) == 1
+
+
+def test_daemon_flushes_when_closed(daemon, client, socket_path, mock_storage):
+    client.start()
+    client.play("rock")
+    client.close()
+
+    daemon.shutdown()
+    daemon.server_close()
+
+    assert mock_storage.saved[-1].turn_history == ["rock"]
+    assert not os.path.exists(socket_path)
+
+
+def test_remove_stale_socket_refuses_running_daemon(daemon, socket_path):
+    with pytest.raises(DaemonError):
+        remove_stale_socket(socket_path)
+
+
+def test_remove_stale_socket_removes_leftover(socket_path):
+    open(socket_path, "w").close()
+
+    remove_stale_socket(socket_path)
+
+    assert not os.path.exists(socket_path)
+
+
+def test_daemon_flushes_on_sigterm(tmp_path, socket_path):
+    state_file = tmp_path / "state.json"
+    serve = textwrap.dedent(
+        f"""
+        from automata.core import daemon, storage
+
+        storage.get_state_file_path = lambda: {str(state_file)!r}
+        daemon.serve({socket_path!r})
+        """
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-c", serve], stdout=subprocess.PIPE, text=True
+    )
+    try:
+        assert "listening" in process.stdout.readline()
+
+        client = DaemonClient.connect(socket_path)
+        client.start()
+        client.log_in("player1")
+        client.play("rock")
+        client.close()
+
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 0
+    finally:
+        process.kill()
+        process.stdout.close()
+
+    assert not os.path.exists(socket_path)
+    saved = InternalGameState.model_validate_json(state_file.read_text())
+    assert saved.username == "player1"
+    assert saved.turn_history == ["rock"]
+
+
+def test_client_path_does_not_import_pydantic():
+    check = (
+        "import sys, automata.__main__, automata.core.daemon_client\n"
+        "assert 'pydantic' not in sys.modules, sorted(sys.modules)\n"
+    )
+
+    subprocess.run([sys.executable, "-c", check], check=True)
+
+
+def test_no_daemon_refuses_to_play_while_daemon_runs(
+    daemon, socket_path, monkeypatch, capsys
+):
+    played = []
+    monkeypatch.setattr(
+        "automata.core.daemon_client.get_socket_path", lambda: socket_path
+    )
+    monkeypatch.setattr("automata.__main__.start_local_game", lambda: played.append(1))
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--no-daemon"])
+
+    assert exit_info.value.code == 1
+    assert "Stop the daemon" in capsys.readouterr().err
+    assert played == []
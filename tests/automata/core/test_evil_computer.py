@@ -1,8 +1,21 @@
 import random
+import threading
 
 import pytest
 
-from automata.core.evil_computer import get_computer_choice
+from automata.core.analytics import UNIFORM_DISTRIBUTION
+from automata.core.evil_computer import (
+    STRATEGIES,
+    MarkovPredictor,
+    StrategyRunner,
+    configure_computer,
+    get_computer_choice,
+    get_computer_distribution,
+    markov_distribution,
+    markov_strategy,
+    prefetch_computer_choice,
+)
+from automata.core.rules import TURN_OPTIONS, get_counter_moves
 
 
 @pytest.fixture
@@ -36,3 +49,198 @@ def test_get_computer_choice_uses_random_choice(mock_random_choice):
 
     result = get_computer_choice()
     assert result == "rock"
+
+
+def test_markov_predictor_without_history():
+    predictor = MarkovPredictor()
+
+    assert predictor.predict() is None
+    assert predictor.counter_move() is None
+
+    predictor.observe("rock")
+    assert predictor.predict() is None
+
+
+def test_markov_predictor_predicts_most_common_follow_up():
+    predictor = MarkovPredictor()
+    for move in ["rock", "paper", "rock", "paper", "rock", "spock", "rock"]:
+        predictor.observe(move)
+
+    assert predictor.predict() == "paper"
+    assert predictor.counter_move() in get_counter_moves("paper")
+
+
+def test_markov_predictor_follows_a_growing_history():
+    history = ["rock", "paper"]
+    predictor = MarkovPredictor()
+
+    predictor.follow(history)
+    history.append("rock")
+    predictor.follow(history)
+
+    assert predictor.moves == {"rock": 2, "paper": 1}
+    assert predictor.transitions["paper"] == {"rock": 1}
+
+    # a different list, like after an undo, is followed from scratch
+    predictor.follow(["spock"])
+    assert predictor.moves == {"spock": 1}
+    assert predictor.transitions == {}
+
+
+def test_markov_distribution():
+    predictor = MarkovPredictor()
+    assert markov_distribution(predictor) == UNIFORM_DISTRIBUTION
+
+    # rock is always followed by paper, and nothing has followed spock yet
+    predictor.follow(["rock", "paper", "rock", "spock"])
+    distribution = dict(zip(TURN_OPTIONS, markov_distribution(predictor)))
+
+    counter_paper = get_counter_moves("paper")[0]
+    counter_rock = get_counter_moves("rock")[0]
+    assert distribution[counter_paper] == pytest.approx(0.5 + 0.25 / 5)
+    assert distribution[counter_rock] == pytest.approx(0.25 + 0.25 / 5)
+    assert sum(distribution.values()) == pytest.approx(1)
+
+
+def test_get_computer_distribution_only_for_strategies_with_a_model(monkeypatch):
+    predictor = MarkovPredictor()
+    predictor.follow(["rock", "rock"])
+
+    monkeypatch.setattr("automata.core.evil_computer._runner", None)
+    assert get_computer_distribution(predictor) is None
+
+    runner = StrategyRunner("markov")
+    monkeypatch.setattr("automata.core.evil_computer._runner", runner)
+    assert get_computer_distribution(predictor) == markov_distribution(predictor)
+    # with nothing to predict from, markov picks at random too
+    assert get_computer_distribution(MarkovPredictor()) is None
+    runner.close()
+
+
+@pytest.fixture
+def mock_strategies(monkeypatch):
+    """Register test strategies, alongside the real ones."""
+    calls = []
+    release = threading.Event()
+
+    def slow(history):
+        release.wait(1)
+        return "spock"
+
+    def counting(history):
+        calls.append(tuple(history))
+        return "lizard"
+
+    def broken(history):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(STRATEGIES, "slow", slow)
+    monkeypatch.setitem(STRATEGIES, "counting", counting)
+    monkeypatch.setitem(STRATEGIES, "broken", broken)
+    monkeypatch.setitem(STRATEGIES, "fallback", lambda history: "paper")
+    yield calls
+    release.set()
+
+
+def test_markov_strategy_counters_predictable_player():
+    choice = markov_strategy(["rock", "paper"] * 5)
+
+    assert choice in get_counter_moves("rock")
+
+
+def test_strategy_runner_without_deadline(mock_strategies):
+    runner = StrategyRunner("counting")
+
+    assert runner.choose(["rock"]) == "lizard"
+    assert mock_strategies == [("rock",)]
+    assert runner.stats.summary()["moves"] == 1
+    runner.close()
+
+
+def test_strategy_runner_falls_back_on_deadline_miss(mock_strategies):
+    runner = StrategyRunner("slow", deadline=0.01, fallback="fallback")
+
+    assert runner.choose([]) == "paper"
+    assert runner.stats.deadline_misses == 1
+    assert "1 deadline misses" in runner.report()
+    runner.close()
+
+
+def test_strategy_runner_falls_back_on_error(mock_strategies):
+    runner = StrategyRunner("broken", deadline=1, fallback="fallback")
+
+    assert runner.choose([]) == "paper"
+    assert runner.stats.errors == 1
+    runner.close()
+
+
+def test_strategy_runner_uses_prefetched_choice(mock_strategies):
+    runner = StrategyRunner("counting", deadline=1)
+
+    runner.prefetch(["rock", "paper"])
+    assert runner.choose(["rock", "paper"]) == "lizard"
+    assert mock_strategies == [("rock", "paper")]
+
+    # a prefetch for a different history isn't used
+    runner.prefetch(["rock"])
+    assert runner.choose(["spock"]) == "lizard"
+    assert mock_strategies[-1] == ("spock",)
+    runner.close()
+
+
+def test_get_computer_choice_uses_configured_strategy(mock_strategies, monkeypatch):
+    monkeypatch.setattr("automata.core.evil_computer._runner", None)
+
+    runner = configure_computer("counting", deadline=1)
+    prefetch_computer_choice(["rock"])
+
+    assert get_computer_choice(["rock"]) == "lizard"
+    assert mock_strategies == [("rock",)]
+    runner.close()
+
+
+def test_strategy_runner_does_not_wait_behind_a_stale_prefetch(monkeypatch):
+    release = threading.Event()
+
+    def gated(history):
+        # the prefetch from before an undo is stuck until the end of the test
+        if history == ("rock", "paper"):
+            release.wait(1)
+        return "lizard"
+
+    monkeypatch.setitem(STRATEGIES, "gated", gated)
+    monkeypatch.setitem(STRATEGIES, "fallback", lambda history: "paper")
+    runner = StrategyRunner("gated", deadline=0.5, fallback="fallback")
+
+    runner.prefetch(["rock", "paper"])
+    # undo the last move, then play again from the shorter history
+    assert runner.choose(["rock"]) == "lizard"
+    assert runner.stats.deadline_misses == 0
+
+    release.set()
+    runner.close()
+
+
+def test_strategy_runner_falls_back_at_once_while_workers_are_busy(mock_strategies):
+    runner = StrategyRunner("slow", deadline=0.01, fallback="fallback", workers=1)
+
+    # the first move overruns, and keeps the only worker busy
+    assert runner.choose([]) == "paper"
+    assert runner.choose(["rock"]) == "paper"
+
+    assert runner.stats.deadline_misses == 2
+    assert runner.stats.latencies[-1] < runner.deadline
+    runner.close()
+
+
+def test_strategy_runner_records_compute_time_of_prefetches(mock_strategies):
+    runner = StrategyRunner("counting", deadline=1)
+
+    runner.prefetch(["rock"])
+    runner.choose(["rock"])
+
+    summary = runner.stats.summary()
+    assert summary["moves"] == 1
+    assert summary["computed"] == 1
+    assert "computed 1 times" in runner.report()
+    runner.close()
@@ -27,9 +27,11 @@ def mock_computer_choice(monkeypatch):
         def __init__(self):
             self.return_value = None
             self.called = False
+            self.histories = []
 
-        def __call__(self):
+        def __call__(self, history=()):
             self.called = True
+            self.histories.append(list(history))
             return self.return_value
 
     mock = MockChoice()
@@ -137,6 +139,7 @@ def test_play_turn_win(mock_save_game_state, mock_computer_choice):
     assert updated_state.score == 1  # Score should increment
     assert updated_state.turn_history == ["rock"]  # Turn should be recorded
     assert mock_computer_choice.called  # Computer choice should be called
+    assert mock_computer_choice.histories == [[]]  # Computer sees the moves before
     assert len(mock_save_game_state) == 1  # State should be saved
     assert (
         mock_save_game_state[0] == updated_state
@@ -175,3 +178,20 @@ def test_play_turn_tie(mock_save_game_state, mock_computer_choice):
     assert (
         mock_save_game_state[0] == updated_state
     )  # Saved state should match updated state
+
+
+def test_play_turn_saves_with_given_function(
+    mock_save_game_state, mock_computer_choice
+):
+    mock_computer_choice.return_value = "scissors"
+    saved = []
+    game_state = InternalGameState(score=0, turn_history=[])
+
+    play_turn(
+        player_choice="rock",
+        game_state=game_state,
+        save=lambda game_state: saved.append(game_state),
+    )
+
+    assert saved == [game_state]
+    assert len(mock_save_game_state) == 0
@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from automata.core.game import determine_turn_outcome
+from automata.core.replay import (
+    EncodedHistory,
+    encode_moves,
+    markov_opponents,
+    random_opponents,
+    replay,
+    summarize_scores,
+)
+from automata.core.rules import TURN_OPTIONS
+
+SCORE_CHANGE = {"win": 1, "lose": -1, "tie": 0}
+
+
+def play_out(turn_history, computer_moves):
+    """Score a game one turn at a time, the way play_turn does."""
+    return sum(
+        SCORE_CHANGE[
+            determine_turn_outcome(
+                player_choice=player, computer_choice=TURN_OPTIONS[computer]
+            ).outcome
+        ]
+        for player, computer in zip(turn_history, computer_moves)
+    )
+
+
+@pytest.fixture
+def turn_history():
+    rng = random.Random(42)
+    return [rng.choice(TURN_OPTIONS) for _ in range(300)]
+
+
+def test_encode_moves():
+    assert encode_moves(["rock", "spock", "paper"]) == bytes([0, 4, 1])
+
+
+def test_scores_match_turn_by_turn_outcomes(turn_history):
+    history = EncodedHistory(turn_history)
+    opponents = list(random_opponents(history, range(20)))
+
+    scores = history.scores(opponents)
+
+    assert scores == [play_out(turn_history, opponent) for opponent in opponents]
+
+
+def test_every_pair_of_moves_is_scored():
+    turn_history = [player for player in TURN_OPTIONS for _ in TURN_OPTIONS]
+    computer_moves = encode_moves(TURN_OPTIONS * len(TURN_OPTIONS))
+
+    outcomes = EncodedHistory(turn_history).outcomes([computer_moves])
+
+    assert len(outcomes) == 25
+    assert outcomes.count(1) == outcomes.count(2) == 10
+    assert EncodedHistory(turn_history).score(computer_moves) == 0
+
+
+def test_scores_reject_wrong_length_opponent(turn_history):
+    with pytest.raises(ValueError):
+        EncodedHistory(turn_history).score(b"\x00")
+
+
+def test_random_opponents_are_reproducible_and_uniform(turn_history):
+    history = EncodedHistory(turn_history)
+
+    first, second = random_opponents(history, [7, 7])
+    assert first == second
+    assert len(first) == len(turn_history)
+
+    moves = b"".join(random_opponents(history, range(100)))
+    assert set(moves) == {0, 1, 2, 3, 4}
+    assert all(abs(moves.count(code) / len(moves) - 0.2) < 0.01 for code in range(5))
+
+
+def test_markov_opponent_punishes_predictable_players():
+    turn_history = ["rock", "paper"] * 50
+
+    (score,) = replay(turn_history, opponent="markov", seeds=[0])
+
+    assert score <= -95
+
+
+def test_markov_opponents_only_differ_where_nothing_is_predicted(turn_history):
+    history = EncodedHistory(turn_history)
+
+    first, second = markov_opponents(history, [1, 2])
+
+    assert sum(a != b for a, b in zip(first, second)) <= len(TURN_OPTIONS) + 1
+
+
+def test_replay_batches_many_seeds(turn_history, monkeypatch):
+    monkeypatch.setattr("automata.core.replay.BATCH_TURNS", 1000)
+
+    scores = replay(turn_history, opponent="random", seeds=range(25))
+
+    history = EncodedHistory(turn_history)
+    assert scores == history.scores(list(random_opponents(history, range(25))))
+
+
+def test_replay_empty_history():
+    assert replay([], opponent="random", seeds=range(3)) == [0, 0, 0]
+
+
+def test_summarize_scores():
+    summary = summarize_scores(
+        [-2, 0, 1, 3, 8], opponent="random", actual_score=1, rounds=10
+    )
+
+    assert summary.seeds == 5
+    assert summary.mean == 2
+    assert summary.minimum == -2
+    assert summary.median == 1
+    assert summary.maximum == 8
+    assert summary.better_than_actual == pytest.approx(0.4)
@@ -0,0 +1,15 @@
+import pytest
+
+from automata.core.rules import GAME_RULES, TURN_OPTIONS, get_counter_moves
+
+
+def test_turn_options_follow_game_rules():
+    assert TURN_OPTIONS == ["rock", "paper", "scissors", "lizard", "spock"]
+
+
+@pytest.mark.parametrize("move", TURN_OPTIONS)
+def test_get_counter_moves(move):
+    counters = get_counter_moves(move)
+
+    assert len(counters) == 2
+    assert all(move in GAME_RULES[counter] for counter in counters)
@@ -0,0 +1,122 @@
+import pytest
+
+from automata.core.evil_computer import StrategyRunner
+from automata.core.scoreboard import Scoreboard
+from automata.core.session import GameSession
+from automata.models import InternalGameState
+
+
+@pytest.fixture
+def saved():
+    """The game states a session saved, in order."""
+    return []
+
+
+def make_session(game_state: InternalGameState, saved: list) -> GameSession:
+    def save(*, game_state: InternalGameState) -> None:
+        saved.append(game_state)
+
+    return GameSession(game_state, save=save)
+
+
+def test_play(saved):
+    session = make_session(InternalGameState(username="player1"), saved)
+
+    result = session.play("rock")
+
+    assert result.startswith("      Your choice: rock\nComputer's choice: ")
+    assert session.game_state.turn_history == ["rock"]
+    assert saved == [session.game_state]
+
+
+def test_undo(saved):
+    session = make_session(InternalGameState(username="player1"), saved)
+    session.play("rock")
+
+    assert session.undo() == "Fine. Let's pretend that never happened."
+    assert session.game_state == InternalGameState(
+        username="player1", score=0, turn_history=[]
+    )
+    assert saved[-1] == session.game_state
+
+
+def test_undo_with_nothing_to_undo(saved):
+    game_state = InternalGameState(username="player1", score=2, turn_history=["rock"])
+    session = make_session(game_state, saved)
+
+    assert session.undo() == "Nothing to undo. What's done is done."
+    assert session.game_state is game_state
+    assert saved == []
+
+
+def test_rewind_to_checkpoint(saved):
+    session = make_session(InternalGameState(username="player1"), saved)
+    session.checkpoint()
+    session.play("rock")
+
+    assert session.rewind() == "Back to round 0. Try again."
+    assert session.game_state.score == 0
+    assert session.game_state.turn_history == []
+    assert saved[-1] == session.game_state
+
+
+def test_rewind_without_checkpoint(saved):
+    game_state = InternalGameState(username="player1")
+    session = make_session(game_state, saved)
+
+    assert session.rewind() == "No checkpoint to go back to."
+    assert session.game_state is game_state
+    assert saved == []
+
+
+def test_restart_keeps_username(saved):
+    session = make_session(
+        InternalGameState(username="player1", score=3, turn_history=["rock"]), saved
+    )
+
+    session.restart()
+
+    assert session.game_state == InternalGameState(username="player1")
+    assert saved == [session.game_state]
+
+
+@pytest.fixture
+def markov_computer(monkeypatch):
+    runner = StrategyRunner("markov")
+    monkeypatch.setattr("automata.core.evil_computer._runner", runner)
+    yield runner
+    runner.close()
+
+
+def test_scoreboard_leaves_out_odds_against_random_computer(saved):
+    game_state = InternalGameState(username="player1", score=20, turn_history=["rock"])
+
+    scoreboard = make_session(game_state, saved).scoreboard()
+
+    assert scoreboard == Scoreboard(username="player1", score=20, rounds=1, odds=None)
+
+
+def test_scoreboard_odds_against_markov_computer(saved, markov_computer):
+    # the computer has learnt to counter rock, so a player who sticks to it loses
+    game_state = InternalGameState(score=0, turn_history=["rock"] * 5)
+
+    odds = make_session(game_state, saved).scoreboard().odds
+
+    assert odds.rounds == 10
+    assert odds.ahead == pytest.approx(0.0)
+    assert odds.best_of == 5
+    assert odds.win_best_of == pytest.approx(0.0)
+
+
+def test_scoreboard_odds_follow_the_players_habits(saved, markov_computer):
+    # paper after rock is expected and countered, but rock after paper isn't
+    session = make_session(InternalGameState(turn_history=["rock", "paper"] * 5), saved)
+
+    first = session.scoreboard().odds
+    session.game_state.turn_history.append("rock")
+    second = session.scoreboard().odds
+
+    assert session.predictor.moves["rock"] == 6
+    assert first is not None
+    assert second is not None
+    assert first != second
@@ -0,0 +1,95 @@
+from automata.core.timeline import GameTimeline, Snapshot
+from automata.models import InternalGameState
+
+
+def play(game_state: InternalGameState, turn, delta: int) -> InternalGameState:
+    game_state.turn_history.append(turn)
+    game_state.score += delta
+    return game_state
+
+
+def test_snapshot_round_trips_game_state():
+    state = InternalGameState(username="player1", score=3, turn_history=["rock"])
+
+    snapshot = Snapshot.from_game_state(state)
+
+    assert snapshot.to_game_state() == state
+    assert snapshot.undoable_moves == 0
+
+
+def test_snapshots_share_history_with_their_parent():
+    root = Snapshot.from_game_state(InternalGameState(turn_history=["rock"]))
+    first = root.extend(turn="paper", score=1)
+    second = first.extend(turn="spock", score=0)
+
+    assert second.parent is first
+    assert second.base_history is root.base_history
+    assert second.turn_history() == ["rock", "paper", "spock"]
+    assert first.turn_history() == ["rock", "paper"]
+
+
+def test_rewind_stops_at_the_start_of_the_session():
+    root = Snapshot.from_game_state(InternalGameState(turn_history=["rock"]))
+    head = root.extend(turn="paper", score=1).extend(turn="lizard", score=2)
+
+    assert head.rewind(1).score == 1
+    assert head.rewind(10) is root
+
+
+def test_timeline_undo_restores_score_and_history():
+    state = InternalGameState(username="player1", score=0, turn_history=[])
+    timeline = GameTimeline(state)
+
+    timeline.record(play(state, "rock", 1))
+    timeline.record(play(state, "paper", -1))
+    timeline.record(play(state, "spock", -1))
+
+    restored = timeline.undo(2)
+
+    assert restored.score == 1
+    assert restored.turn_history == ["rock"]
+    assert restored.username == "player1"
+    assert timeline.head.undoable_moves == 1
+
+
+def test_timeline_rewind_to_checkpoint_allows_branching():
+    state = InternalGameState(score=0, turn_history=[])
+    timeline = GameTimeline(state)
+    timeline.record(play(state, "rock", 1))
+    checkpoint = timeline.checkpoint()
+
+    timeline.record(play(state, "paper", -1))
+    state = timeline.rewind()
+    assert state == InternalGameState(score=1, turn_history=["rock"])
+
+    timeline.record(play(state, "lizard", 1))
+    assert timeline.head.parent is checkpoint
+    assert timeline.head.turn_history() == ["rock", "lizard"]
+
+    # the checkpoint is still there to go back to
+    assert timeline.rewind() == InternalGameState(score=1, turn_history=["rock"])
+
+
+def test_timeline_rewind_without_checkpoint():
+    timeline = GameTimeline(InternalGameState())
+
+    assert timeline.rewind() is None
+
+
+def test_timeline_record_ignores_unchanged_state():
+    state = InternalGameState(score=0, turn_history=["rock"])
+    timeline = GameTimeline(state)
+    head = timeline.head
+
+    assert timeline.record(state) is head
+
+
+def test_timeline_record_resets_on_unrelated_state():
+    timeline = GameTimeline(InternalGameState(score=0, turn_history=[]))
+    timeline.checkpoint()
+
+    timeline.record(InternalGameState(score=5, turn_history=["rock", "paper"]))
+
+    assert timeline.checkpoints == []
+    assert timeline.head.undoable_moves == 0
+    assert timeline.head.score == 5
@@ -0,0 +1,288 @@
+import io
+import json
+
+import pytest
+
+from automata.core.transfer import (
+    Progress,
+    TransferError,
+    export_states,
+    get_user_file_name,
+    import_states,
+    parse_line,
+    read_state_file,
+    validate_lines,
+)
+from automata.models import InternalGameState
+
+
+@pytest.fixture
+def state_files(tmp_path):
+    """Write game states to files, the way save_game_state does."""
+
+    def write(*states: InternalGameState):
+        paths = []
+        for index, state in enumerate(states):
+            path = tmp_path / f"state-{index}.json"
+            path.write_text(state.model_dump_json())
+            paths.append(str(path))
+        return paths
+
+    return write
+
+
+@pytest.fixture
+def mock_state_file_path(tmp_path, monkeypatch):
+    path = tmp_path / "automata-game_state.json"
+    monkeypatch.setattr("automata.core.transfer.get_state_file_path", lambda: str(path))
+    return path
+
+
+def export_lines(paths, chunk_turns=3):
+    output = io.StringIO()
+    export_states(paths, output, chunk_turns=chunk_turns)
+    return output.getvalue().splitlines(keepends=True)
+
+
+def test_read_state_file_streams_turns_in_chunks(state_files):
+    state = InternalGameState(
+        username="player1", score=2, turn_history=["rock", "paper"] * 5
+    )
+    (path,) = state_files(state)
+
+    # A tiny read size makes values straddle reads
+    records = list(read_state_file(path, chunk_turns=4, read_size=3))
+
+    assert [len(record.get("turns", [])) for record in records] == [4, 4, 2, 0]
+    assert records[-1] == {
+        "record": "state",
+        "username": "player1",
+        "score": 2,
+        "rounds": 10,
+    }
+
+
+def test_read_state_file_accepts_any_key_order(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text(
+        '{ "turn_history" : [ "spock" , "lizard" ],\n "score": 123, "username": null }'
+    )
+
+    records = list(read_state_file(str(path), read_size=5))
+
+    assert records[0]["turns"] == ["spock", "lizard"]
+    assert records[-1]["score"] == 123
+    assert records[-1]["username"] is None
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "",
+        "[]",
+        '{"score": "lots"}',
+        '{"turn_history": ["rock"',
+        '{"turn_history": ["rock", "dynamite"]}',
+        '{"turn_history": ["rock", 7]}',
+        '{"turn_history": ["rock", [1]]}',
+        '{"turn_history": [{"move": "rock"}]}',
+    ],
+)
+def test_read_state_file_rejects_invalid_files(tmp_path, content):
+    path = tmp_path / "state.json"
+    path.write_text(content)
+
+    with pytest.raises(TransferError):
+        list(read_state_file(str(path)))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_export_then_import_round_trips(state_files, tmp_path, workers):
+    states = [
+        InternalGameState(username="player1", score=3, turn_history=["rock"] * 7),
+        InternalGameState(username="player2", score=-1, turn_history=[]),
+    ]
+    lines = export_lines(state_files(*states))
+    output_dir = tmp_path / "imported"
+    output_dir.mkdir()
+
+    written = import_states(lines, output_dir=str(output_dir), workers=workers)
+
+    assert len(written) == 2
+    for path, state in zip(written, states):
+        with open(path) as file:
+            assert InternalGameState.model_validate_json(file.read()) == state
+
+
+def test_import_restores_current_game(state_files, mock_state_file_path):
+    state = InternalGameState(username="player1", score=1, turn_history=["spock"])
+    lines = export_lines(state_files(state))
+
+    import_states(lines)
+
+    restored = InternalGameState.model_validate_json(mock_state_file_path.read_text())
+    assert restored == state
+
+
+def test_import_of_many_users_needs_a_directory(state_files, mock_state_file_path):
+    lines = export_lines(
+        state_files(InternalGameState(username="a"), InternalGameState(username="b"))
+    )
+
+    with pytest.raises(TransferError):
+        import_states(lines)
+
+    # nothing is restored, and no temporary files are left behind
+    assert sorted(path.name for path in mock_state_file_path.parent.iterdir()) == [
+        "state-0.json",
+        "state-1.json",
+    ]
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        ['{"record":"turns","turns":["rock"]}\n'],
+        ['{"record":"state","username":"a","score":0,"rounds":2}\n'],
+        ['{"record":"state","username":"a","score":0,"rounds":true}\n'],
+        ['{"record":"state","username":"a","score":0,"rounds":-1}\n'],
+        ['{"record":"turns","turns":["dynamite"]}\n'],
+        ['{"record":"turns","turns":[[1]]}\n'],
+        ['{"record":"turns","turns":["rock",{"move":"paper"}]}\n'],
+        ['{"record":"mystery"}\n'],
+        ["not json\n"],
+    ],
+)
+def test_import_rejects_invalid_streams(lines, mock_state_file_path):
+    with pytest.raises(TransferError):
+        import_states(lines)
+
+    assert not mock_state_file_path.exists()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_to_directory_rejects_nested_turns(tmp_path, workers):
+    lines = [
+        '{"record":"turns","turns":[[1]]}\n',
+        '{"record":"state","username":"a","score":0,"rounds":1}\n',
+    ]
+
+    with pytest.raises(TransferError):
+        import_states(lines, output_dir=str(tmp_path), workers=workers)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_validate_lines():
+    validate_lines(
+        [
+            '{"record":"turns","turns":["rock","paper"]}',
+            '{"record":"state","username":"a","score":1,"rounds":2}',
+        ]
+    )
+
+    with pytest.raises(TransferError):
+        validate_lines(['{"record":"turns","turns":["rock"]}', "{}"])
+
+
+@pytest.mark.parametrize("score,expected", [("true", 1), ('"7_0"', 70)])
+def test_import_writes_the_validated_score(score, expected, mock_state_file_path):
+    line = f'{{"record":"state","username":"a","score":{score},"rounds":0}}\n'
+
+    import_states([line])
+
+    restored = InternalGameState.model_validate_json(mock_state_file_path.read_text())
+    assert restored == InternalGameState(username="a", score=expected)
+    assert json.loads(mock_state_file_path.read_text())["score"] == expected
+
+
+def test_parse_line_returns_turns_as_json_items():
+    record = parse_line('{"turns": ["rock", "paper"], "record": "turns"}')
+
+    assert record == {"record": "turns", "items": '"rock","paper"', "count": 2}
+
+
+def test_get_user_file_name():
+    assert get_user_file_name("player-1") == "player-1.json"
+    assert get_user_file_name("../../etc/passwd").startswith("______etc_passwd-")
+    assert get_user_file_name(None).startswith("Player-")
+
+
+def test_get_user_file_name_never_shares_a_file():
+    names = ["a b", "a_b", "a/b", None, "Player", "x" * 65, "x" * 64]
+
+    file_names = [get_user_file_name(name) for name in names]
+
+    assert len(set(file_names)) == len(names)
+    assert file_names[1] == "a_b.json"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_to_directory_keeps_users_with_similar_names(
+    state_files, tmp_path, workers
+):
+    states = [
+        InternalGameState(username="a b", score=1),
+        InternalGameState(username="a_b", score=2),
+        InternalGameState(username=None, score=3),
+    ]
+    lines = export_lines(state_files(*states))
+    output_dir = tmp_path / "imported"
+    output_dir.mkdir()
+
+    written = import_states(lines, output_dir=str(output_dir), workers=workers)
+
+    assert len(set(written)) == 3
+    for path, state in zip(written, states):
+        with open(path) as file:
+            assert InternalGameState.model_validate_json(file.read()) == state
+
+
+def test_import_refuses_two_users_with_one_file(state_files, tmp_path):
+    lines = export_lines(
+        state_files(InternalGameState(username=None), InternalGameState(username=None))
+    )
+    output_dir = tmp_path / "imported"
+    output_dir.mkdir()
+
+    with pytest.raises(TransferError):
+        import_states(lines, output_dir=str(output_dir))
+
+    assert list(output_dir.iterdir()) == []
+
+
+def test_progress_reports_throughput():
+    stream = io.StringIO()
+    progress = Progress("Exported", stream=stream, every=3600)
+
+    progress.add(users=1, turns=500)
+    assert stream.getvalue() == ""
+
+    progress.report(final=True)
+    assert stream.getvalue().startswith("Exported 1 users, 500 turns in ")
+    assert stream.getvalue().endswith("turns/s)\n")
+
+
+def test_export_lines_are_compact(state_files):
+    (path,) = state_files(InternalGameState(username="a", turn_history=["rock"]))
+
+    lines = export_lines([path])
+
+    assert lines[0] == '{"record":"turns","turns":["rock"]}\n'
+    assert json.loads(lines[1])["rounds"] == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_reads_lines_not_written_by_export(tmp_path, workers):
+    lines = [
+        '{"turns": ["rock"], "record": "turns"}\n',
+        '{"record":"turns","turns":[]}\n',
+        '{"record":"turns","turns":[ "spock" ]}\n',
+        '{"record":"state","username":"a","score":0,"rounds":2}\n',
+    ]
+
+    (path,) = import_states(lines, output_dir=str(tmp_path), workers=workers)
+
+    with open(path) as file:
+        state = InternalGameState.model_validate_json(file.read())
+    assert state.turn_history == ["rock", "spock"]
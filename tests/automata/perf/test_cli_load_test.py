@@ -0,0 +1,82 @@
+import sys
+
+import pytest
+
+from automata.perf.cli_load_test import (
+    FrameTiming,
+    SessionReport,
+    build_script,
+    format_report,
+    run_session,
+    summarize,
+    summarize_components,
+)
+
+
+def test_build_script_is_reproducible():
+    first = build_script(rounds=50, seed=7)
+    second = build_script(rounds=50, seed=7)
+
+    assert first == second
+
+
+def test_build_script_plays_every_round_and_quits():
+    steps = build_script(rounds=200, seed=3, invalid_rate=0.2, restart_rate=0.1)
+
+    moves = [step for step in steps if step.kind == "move"]
+    assert len(moves) == 200
+    assert all(step.keys in {"1", "2", "3", "4", "5"} for step in moves)
+    assert any(step.kind == "invalid" for step in steps)
+    assert any(step.kind == "restart" for step in steps)
+    assert steps[-1].kind == "quit"
+
+
+def test_summarize_groups_frames_by_step_and_phase():
+    report = SessionReport(
+        frames=[
+            FrameTiming("move", "turn", 0.001, 100),
+            FrameTiming("move", "turn", 0.003, 300),
+            FrameTiming("move", "redraw", 0.002, 50),
+        ]
+    )
+
+    summary = summarize(report)
+
+    assert set(summary) == {"move/turn", "move/redraw"}
+    assert summary["move/turn"]["count"] == 2
+    assert summary["move/turn"]["mean_ms"] == pytest.approx(2.0)
+    assert summary["move/turn"]["max_ms"] == pytest.approx(3.0)
+    assert summary["move/turn"]["mean_bytes"] == 200
+    assert report.rounds == 2
+    assert "move/redraw" in format_report(report)
+
+
+def test_summarize_components_keeps_component_order():
+    report = SessionReport(
+        total_seconds=1.0,
+        components={"score": [0.002, 0.004], "clear": [0.010]},
+    )
+
+    summary = summarize_components(report)
+
+    assert list(summary) == ["clear", "score"]
+    assert summary["score"]["mean_ms"] == pytest.approx(3.0)
+    assert "score" in format_report(report)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires a POSIX pty")
+def test_run_session_drives_the_cli():
+    steps = build_script(rounds=5, seed=1, invalid_rate=0.3, restart_rate=0.3)
+
+    report = run_session(steps)
+
+    assert report.rounds == 5
+    assert report.startup_seconds > 0
+    assert report.total_seconds >= report.harness_startup_seconds > 0
+    assert len(report.components["turn"]) == 5
+    assert len(report.components["save"]) >= 5
+    assert {"clear", "title", "width", "score", "odds", "options"} <= set(
+        report.components
+    )
+    # every frame's output is counted, including what was read with earlier frames
+    assert all(frame.output_bytes > 0 for frame in report.frames)
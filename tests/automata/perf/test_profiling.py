@@ -0,0 +1,86 @@
+import pstats
+import sys
+import tracemalloc
+
+from automata.perf.profiling import AllocationTracker, fold_stack, profile_session
+
+PROBES = [(__name__, "build_list")]
+
+
+def build_list(size):
+    return list(range(size))
+
+
+def build_then_call(size, func, *args):
+    kept = build_list(size)
+    return kept, func(*args)
+
+
+def busy_loop():
+    total = 0
+    for i in range(200_000):
+        total += i * i
+    return total
+
+
+def test_fold_stack_runs_from_root_to_leaf():
+    def leaf():
+        return fold_stack(sys._getframe())
+
+    stack = leaf().split(";")
+
+    assert stack[-1].startswith("leaf (test_profiling.py:")
+    assert stack[-2].startswith("test_fold_stack_runs_from_root_to_leaf (")
+
+
+def test_profile_session_writes_pstats_and_folded_stacks(tmp_path, capsys):
+    prefix = str(tmp_path / "session")
+
+    with profile_session(prefix, sample_interval=0.0005):
+        busy_loop()
+
+    stats = pstats.Stats(f"{prefix}.pstats")
+    assert any(func[2] == "busy_loop" for func in stats.stats)  # type: ignore[attr-defined]
+
+    folded = (tmp_path / "session.folded").read_text().splitlines()
+    assert folded
+    _, count = folded[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert "busy_loop" in "".join(folded)
+    assert not (tmp_path / "session.memory.txt").exists()
+    assert "session.pstats" in capsys.readouterr().err
+
+
+def test_profile_session_records_allocations_per_call(tmp_path):
+    prefix = str(tmp_path / "session")
+
+    original = build_list
+
+    with profile_session(prefix, memory=True, probes=PROBES):
+        assert build_list is not original
+        build_list(10_000)
+        build_list(10)
+
+    # the probed function is only wrapped while profiling
+    assert build_list is original
+    report = (tmp_path / "session.memory.txt").read_text()
+    assert report.count("build_list") >= 2
+    assert "Top allocation growth" in report
+
+
+def test_nested_calls_are_measured_independently():
+    tracker = AllocationTracker()
+    outer = tracker.probe("outer", build_then_call)
+    inner = tracker.probe("inner", build_list)
+
+    tracemalloc.start()
+    try:
+        outer(100_000, inner, 10)
+    finally:
+        tracemalloc.stop()
+
+    inner_call, outer_call = tracker.calls
+    assert inner_call.name == "inner"
+    # the outer call's list is still alive, but isn't counted against the inner one
+    assert inner_call.peak_bytes < 10_000
+    assert outer_call.peak_bytes >= 100_000 * 8
@@ -0,0 +1,33 @@
+import pytest
+
+from automata.__main__ import parse_args
+
+
+def test_parse_args_replay():
+    args = parse_args(["replay", "--opponent", "markov", "--seeds", "10"])
+
+    assert args.command == "replay"
+    assert args.opponent == "markov"
+    assert args.seeds == 10
+
+
+@pytest.mark.parametrize("seeds", ["0", "-5"])
+def test_parse_args_rejects_replay_without_seeds(seeds, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args(["replay", "--seeds", seeds])
+
+    assert exit_info.value.code == 2
+    assert "--seeds" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("deadline", ["0", "-1"])
+def test_parse_args_rejects_deadlines_every_move_would_miss(deadline, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args(["--strategy", "markov", "--move-deadline-ms", deadline])
+
+    assert exit_info.value.code == 2
+    assert "--move-deadline-ms" in capsys.readouterr().err
+
+
+def test_parse_args_accepts_a_positive_deadline():
+    assert parse_args(["--move-deadline-ms", "0.5"]).move_deadline_ms == 0.5
@@ -1,73 +1,40 @@
-import pytest
-
-from automata.models import InternalGameState, TurnResult
-
-
-@pytest.fixture
-def mock_load_game_state(monkeypatch):
-    """Mock the load_game_state function."""
-
-    # Create a mock object that we can check call counts on
-    class MockLoadGameState:
-        def __init__(self):
-            self.call_count = 0
-            self.result = InternalGameState()
-            pass
-
-        def __call__(self):
-            self.call_count += 1
-            return self.result
-
-    mock_load_game_state = MockLoadGameState()
-    monkeypatch.setattr("automata.ui.cli.load_game_state", mock_load_game_state)
-    return mock_load_game_state
-
-
-@pytest.fixture
-def mock_save_game_state(monkeypatch):
-    """Mock the save_game_state function."""
-
-    class MockSaveGameState:
-        def __init__(self):
-            self.call_count = 0
-            self.calls = []
-            self.state = InternalGameState()
-
-        def __call__(self, game_state: InternalGameState):
-            self.call_count += 1
-            self.calls.append(game_state)
-            self.state = game_state
+from automata.core.session import GameSession
+from automata.models import InternalGameState, ReplaySummary
+from automata.ui.cli import print_replay_summary, start_game
+
+
+def test_print_replay_summary(capsys):
+    summary = ReplaySummary(
+        opponent="markov",
+        seeds=20,
+        rounds=100,
+        actual_score=4,
+        mean=-1.5,
+        stdev=2.25,
+        minimum=-6,
+        maximum=3,
+        p5=-5,
+        median=-1,
+        p95=2,
+        better_than_actual=0.0,
+    )
 
-    mock_save = MockSaveGameState()
-    monkeypatch.setattr("automata.ui.cli.save_game_state", mock_save)
-    return mock_save
+    print_replay_summary(summary=summary)
 
+    output = capsys.readouterr().out
+    assert "Replayed 100 rounds against the markov computer, 20 times" in output
+    assert "Mean score:    -1.50 (stdev 2.25)" in output
+    assert "Beat actual:   0.0% of replays" in output
 
-@pytest.fixture
-def mock_play_turn(monkeypatch):
-    """Mock the play_turn function."""
-    result = TurnResult(
-        player_choice="rock",
-        computer_choice="scissors",
-        outcome="win",
-        reason="You win. I'll allow it this time.. Rock crushes Scissors",
-    )
 
-    # Create a mock object that we can check call counts on
-    class MockPlayTurn:
-        def __init__(self):
-            self.call_count = 0
-            self.calls = []
-            self.result = result
-            pass
+def test_start_game_plays_the_saved_game(monkeypatch):
+    game_state = InternalGameState(username="player1", score=5)
+    played = []
+    monkeypatch.setattr("automata.ui.cli.load_game_state", lambda: game_state)
+    monkeypatch.setattr("automata.ui.cli.play_game", played.append)
 
-        def __call__(self, player_choice, game_state):
-            self.call_count += 1
-            self.calls.append((player_choice, game_state))
-            game_state.turn_history.append(player_choice)
-            game_state.score += 1
-            return result, game_state
+    start_game()
 
-    mock_play = MockPlayTurn()
-    monkeypatch.setattr("automata.ui.cli.play_turn", mock_play)
-    return mock_play
+    assert len(played) == 1
+    assert isinstance(played[0], GameSession)
+    assert played[0].game_state is game_state
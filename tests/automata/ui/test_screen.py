@@ -0,0 +1,62 @@
+import pytest
+
+from automata.core.scoreboard import Odds, Scoreboard
+from automata.ui.screen import get_player_choice, print_scoreboard
+
+
+@pytest.fixture
+def mock_input(monkeypatch):
+    """Feed scripted answers to input(), and ignore screen clears."""
+
+    def set_inputs(*answers):
+        remaining = list(answers)
+        monkeypatch.setattr("builtins.input", lambda prompt="": remaining.pop(0))
+
+    monkeypatch.setattr("automata.ui.screen.clear_screen", lambda: None)
+    return set_inputs
+
+
+@pytest.mark.parametrize(
+    "key,expected",
+    [
+        ("1", "rock"),
+        ("5", "spock"),
+        ("R", "restart"),
+        ("l", "log_out"),
+        ("u", "undo"),
+        ("c", "checkpoint"),
+        ("b", "rewind"),
+    ],
+)
+def test_get_player_choice(mock_input, key, expected):
+    mock_input(key)
+
+    assert get_player_choice() == expected
+
+
+def test_get_player_choice_retries_invalid_input(mock_input):
+    mock_input("x", "9", "2")
+
+    assert get_player_choice() == "paper"
+
+
+def test_print_scoreboard(capsys):
+    print_scoreboard(scoreboard=Scoreboard(username=None, score=-3, rounds=8))
+
+    output = capsys.readouterr().out
+    assert "Hello Player," in output
+    assert "Score: -3" in output
+    assert "Rounds played: 8" in output
+    assert "Chance" not in output
+
+
+def test_print_scoreboard_with_odds(capsys):
+    odds = Odds(rounds=10, ahead=0.25, best_of=5, win_best_of=0.5)
+
+    print_scoreboard(
+        scoreboard=Scoreboard(username="player1", score=0, rounds=1, odds=odds)
+    )
+
+    output = capsys.readouterr().out
+    assert "Chance you're ahead after 10 more rounds: 25.0%" in output
+    assert "Chance you win a best of 5: 50.0%" in output